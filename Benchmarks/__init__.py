@@ -0,0 +1 @@
+__all__ = ["export", "generate", "load_http", "memory", "run", "startup"]
@@ -0,0 +1,51 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+from Data import db, exporter
+from Benchmarks import generate
+
+
+def bench_export(kinds=("books", "borrows", "favorites"), fmts=("csv", "jsonl")):
+    out_dir = tempfile.mkdtemp(prefix="export-bench-")
+    results = []
+    for kind in kinds:
+        for fmt in fmts:
+            path = os.path.join(out_dir, f"{kind}.{fmt}")
+            start = time.perf_counter()
+            rows = exporter.export(kind, path)
+            elapsed = time.perf_counter() - start
+            results.append(
+                {
+                    "name": f"export.{kind}.{fmt}",
+                    "rows": rows,
+                    "seconds": round(elapsed, 4),
+                    "rows_per_sec": round(rows / elapsed) if elapsed else None,
+                }
+            )
+            os.remove(path)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export throughput benchmark")
+    parser.add_argument("--db", help="existing database to export from")
+    parser.add_argument("--scale", choices=sorted(generate.SCALES), default="small")
+    args = parser.parse_args(argv)
+
+    if args.db:
+        db.DB_PATH = args.db
+    else:
+        db.DB_PATH = os.path.join(tempfile.mkdtemp(prefix="export-bench-"), "bench.db")
+        generate.generate(**generate.SCALES[args.scale])
+
+    json.dump(bench_export(), sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,222 @@
+import argparse
+import hashlib
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Iterator, List, Tuple
+
+from Data import db, importer
+
+SCALES = {
+    "small": {"books": 10_000, "users": 1_000, "borrows": 100_000, "favorites": 20_000},
+    "medium": {
+        "books": 100_000,
+        "users": 10_000,
+        "borrows": 1_000_000,
+        "favorites": 200_000,
+    },
+    "full": {
+        "books": 1_000_000,
+        "users": 100_000,
+        "borrows": 10_000_000,
+        "favorites": 2_000_000,
+    },
+}
+
+CATEGORIES = (
+    "Fiction",
+    "Fantasy",
+    "Science Fiction",
+    "Classic",
+    "Programming",
+    "Self-help",
+    "History",
+    "Biography",
+    "Mystery",
+    "Poetry",
+    "Philosophy",
+    "Science",
+)
+
+WORDS = (
+    "night shadow river garden empire silent winter crown glass letter city "
+    "storm memory ocean forest journey secret machine mountain fire stone "
+    "kingdom voice dream harbor signal lantern orchard compass echo atlas"
+).split()
+
+BATCH = 20_000
+EPOCH = datetime(2015, 1, 1)
+END = datetime(2026, 1, 1)
+SPAN = int((END - EPOCH).total_seconds())
+RECENT = 60 * 86400
+PASSWORD_HASH = hashlib.sha256(b"password").hexdigest()
+
+
+def copy_db(path: str) -> str:
+    # Benchmarks write to the database; run them on a copy of a real one.
+    copy = os.path.join(tempfile.mkdtemp(prefix="bench-"), os.path.basename(path))
+    src = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    dst = sqlite3.connect(copy)
+    try:
+        src.backup(dst)
+    finally:
+        dst.close()
+        src.close()
+    return copy
+
+
+def _timestamp(seconds: int) -> str:
+    return (EPOCH + timedelta(seconds=seconds)).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def iter_books(count: int, seed: int = 1) -> Iterator[Tuple]:
+    rng = random.Random(seed)
+    authors = [
+        f"{rng.choice(WORDS).title()} {rng.choice(WORDS).title()}son"
+        for _ in range(max(count // 20, 1))
+    ]
+    for i in range(count):
+        words = rng.sample(WORDS, rng.randint(2, 5))
+        yield (
+            f"{' '.join(words).title()} {i}",
+            rng.choice(authors),
+            rng.randint(1800, 2025),
+            rng.choice(CATEGORIES),
+            f"A story about {' and '.join(rng.sample(WORDS, 2))}",
+            rng.choice((1, 1, 1, 2, 3, 5)),
+        )
+
+
+def iter_users(count: int) -> Iterator[Tuple]:
+    for i in range(count):
+        yield (f"user{i:07d}", PASSWORD_HASH)
+
+
+def iter_borrows(count: int, users: int, books: int, seed: int = 2) -> Iterator[Tuple]:
+    rng = random.Random(seed)
+    for _ in range(count):
+        start = rng.randrange(SPAN)
+        due = start + rng.choice((7, 14, 21, 28)) * 86400
+        returned = None
+        if start < SPAN - RECENT or rng.random() < 0.5:
+            returned = _timestamp(min(start + rng.randrange(1, 35 * 86400), SPAN))
+        yield (
+            rng.randint(1, users),
+            rng.randint(1, books),
+            _timestamp(start),
+            returned,
+            _timestamp(due),
+        )
+
+
+def iter_favorites(count: int, users: int, books: int, seed: int = 3) -> Iterator[Tuple]:
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield (rng.randint(1, users), rng.randint(1, books), _timestamp(rng.randrange(SPAN)))
+
+
+def _insert(conn: sqlite3.Connection, sql: str, rows: Iterator[Tuple]) -> int:
+    total = 0
+    while True:
+        batch: List[Tuple] = list(islice(rows, BATCH))
+        if not batch:
+            return total
+        with conn:
+            conn.executemany(sql, batch)
+        total += len(batch)
+
+
+def _without_maintenance(conn: sqlite3.Connection, table: str, load):
+    saved = conn.execute(
+        "SELECT type, name, sql FROM sqlite_master WHERE type IN ('index', 'trigger') AND tbl_name = ? AND sql IS NOT NULL",
+        (table,),
+    ).fetchall()
+    with conn:
+        for kind, name, _ in saved:
+            conn.execute(f'DROP {kind.upper()} IF EXISTS "{name}"')
+    try:
+        return load()
+    finally:
+        with conn:
+            for _, _, sql in saved:
+                conn.execute(sql)
+
+
+def generate(
+    books: int, users: int, borrows: int, favorites: int, seed: int = 1
+) -> dict:
+    db.init_db()
+    conn = db.get_conn()
+    timings = {}
+
+    start = time.perf_counter()
+    importer.import_books(iter_books(books, seed), batch_size=BATCH)
+    timings["books"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    _insert(
+        conn,
+        "INSERT INTO users (username, password_hash) VALUES (?, ?)",
+        iter_users(users),
+    )
+    timings["users"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    _without_maintenance(
+        conn,
+        "borrows",
+        lambda: _insert(
+            conn,
+            "INSERT INTO borrows (user_id, book_id, borrowed_at, returned_at, due_date) VALUES (?, ?, ?, ?, ?)",
+            iter_borrows(borrows, users, books, seed + 1),
+        ),
+    )
+    db.inventory_rebuild()
+    timings["borrows"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    _without_maintenance(
+        conn,
+        "favorites",
+        lambda: _insert(
+            conn,
+            "INSERT OR IGNORE INTO favorites (user_id, book_id, added_at) VALUES (?, ?, ?)",
+            iter_favorites(favorites, users, books, seed + 2),
+        ),
+    )
+    timings["favorites"] = time.perf_counter() - start
+
+    db.stats_rebuild()
+    conn.execute("ANALYZE")
+    db.invalidate_catalog()
+    return {k: round(v, 2) for k, v in timings.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic library")
+    parser.add_argument("path", help="database file to create")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--books", type=int)
+    parser.add_argument("--users", type=int)
+    parser.add_argument("--borrows", type=int)
+    parser.add_argument("--favorites", type=int)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    sizes = dict(SCALES[args.scale])
+    for key in sizes:
+        if getattr(args, key) is not None:
+            sizes[key] = getattr(args, key)
+
+    db.DB_PATH = args.path
+    print(generate(seed=args.seed, **sizes))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+import argparse
+import http.client
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from typing import List
+
+from Data import db
+from Benchmarks import generate
+from Benchmarks.run import summarize
+
+import server
+
+
+def _client(port: int, requests: int, write_ratio: float, sizes: dict, seed: int, out: dict):
+    rng = random.Random(seed)
+    queries = ["night", "river", "tolkien", "compass", "echo"]
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    samples, errors = [], 0
+    for _ in range(requests):
+        user_id = rng.randint(1, sizes["users"])
+        book_id = rng.randint(1, sizes["books"])
+        method, body = "GET", None
+        if rng.random() < write_ratio:
+            method = "POST"
+            path = rng.choice(("/borrow", "/return", "/favorites"))
+            body = json.dumps({"user_id": user_id, "book_id": book_id})
+        else:
+            path = rng.choice(
+                (
+                    f"/search?q={rng.choice(queries)}&limit=50",
+                    "/books?limit=100",
+                    f"/users/{user_id}/borrows",
+                    f"/users/{user_id}/favorites",
+                )
+            )
+        headers = {"Content-Type": "application/json"} if body else {}
+        start = time.perf_counter()
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            if response.status >= 500:
+                errors += 1
+        except (OSError, http.client.HTTPException):
+            errors += 1
+        finally:
+            conn.close()
+        samples.append(time.perf_counter() - start)
+    out["samples"], out["errors"] = samples, errors
+
+
+def load_test(
+    clients: int = 200, requests: int = 50, write_ratio: float = 0.2, readers: int = 16
+) -> dict:
+    conn = db.get_conn()
+    sizes = {
+        "books": conn.execute("SELECT COALESCE(MAX(id), 1) FROM books").fetchone()[0],
+        "users": conn.execute("SELECT COALESCE(MAX(id), 1) FROM users").fetchone()[0],
+    }
+    httpd, _ = server.serve_in_thread(readers=readers)
+    port = httpd.server_port
+
+    outputs: List[dict] = [{} for _ in range(clients)]
+    threads = [
+        threading.Thread(
+            target=_client, args=(port, requests, write_ratio, sizes, i, outputs[i])
+        )
+        for i in range(clients)
+    ]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    httpd.shutdown()
+    httpd.server_close()
+
+    samples = [s for o in outputs for s in o["samples"]]
+    return summarize(
+        "http.load",
+        samples,
+        clients=clients,
+        readers=readers,
+        write_ratio=write_ratio,
+        errors=sum(o["errors"] for o in outputs),
+        seconds=round(elapsed, 4),
+        requests_per_sec=round(len(samples) / elapsed, 2),
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP service load test")
+    parser.add_argument("--db", help="serve a copy of an existing database")
+    parser.add_argument(
+        "--in-place", action="store_true", help="serve --db itself instead of a copy"
+    )
+    parser.add_argument("--scale", choices=sorted(generate.SCALES), default="small")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=50, help="requests per client")
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--readers", type=int, default=16)
+    args = parser.parse_args(argv)
+
+    if args.db:
+        if not os.path.exists(args.db):
+            parser.error(f"database not found: {args.db}")
+        db.DB_PATH = args.db if args.in_place else generate.copy_db(args.db)
+        db.init_db()
+    else:
+        db.DB_PATH = os.path.join(tempfile.mkdtemp(prefix="http-bench-"), "bench.db")
+        generate.generate(**generate.SCALES[args.scale])
+
+    result = load_test(args.clients, args.requests, args.write_ratio, args.readers)
+    print(json.dumps(result, indent=2))
+    return 1 if result["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import List
+
+from Data import db, importer
+from Data.columns import BookColumns
+from Benchmarks import generate
+
+SQL = "SELECT id, title, author, year, category, description, copies, available FROM books ORDER BY title COLLATE NOCASE, id"
+
+
+def _measure(name: str, load, rows: int) -> dict:
+    start = time.perf_counter()
+    data = load()
+    loaded = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in data:
+        pass
+    scanned = time.perf_counter() - start
+
+    picks = range(0, len(data), max(len(data) // 10_000, 1))
+    start = time.perf_counter()
+    for i in picks:
+        data[i]
+    picked = time.perf_counter() - start
+
+    del data
+    gc.collect()
+    tracemalloc.start()
+    data = load()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return {
+        "name": name,
+        "rows": rows,
+        "memory_mb": round(size / 2**20, 2),
+        "bytes_per_row": round(size / max(rows, 1), 1),
+        "load_seconds": round(loaded, 4),
+        "scan_seconds": round(scanned, 4),
+        "random_access_us": round(picked / max(len(picks), 1) * 1e6, 3),
+    }
+
+
+def bench_memory(rows: int) -> List[dict]:
+    db.close_conn()
+    db.DB_PATH = os.path.join(tempfile.mkdtemp(prefix="memory-bench-"), "bench.db")
+    db.init_db()
+    importer.import_books(generate.iter_books(rows))
+    conn = db.get_conn()
+
+    results = [
+        _measure(f"catalog.tuples.{rows}", lambda: conn.execute(SQL).fetchall(), rows),
+        _measure(f"catalog.columns.{rows}", lambda: BookColumns.from_cursor(conn.execute(SQL)), rows),
+    ]
+    results[1]["saved_pct"] = round(
+        (1 - results[1]["memory_mb"] / results[0]["memory_mb"]) * 100, 1
+    )
+    db.close_conn()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Catalog memory: tuples vs BookColumns")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    args = parser.parse_args(argv)
+
+    results = []
+    for rows in args.rows:
+        results.extend(bench_memory(rows))
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,445 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from Data import autocomplete, db
+from Data.auth import AuthService
+from Data.group_commit import GroupCommitWriter
+from Benchmarks import generate
+from Benchmarks.export import bench_export
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    rank = max(int(round(pct / 100.0 * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def summarize(name: str, samples: List[float], **extra) -> dict:
+    ms = [s * 1000.0 for s in samples]
+    result = {
+        "name": name,
+        "n": len(ms),
+        "mean_ms": round(sum(ms) / len(ms), 4),
+        "p50_ms": round(percentile(ms, 50), 4),
+        "p95_ms": round(percentile(ms, 95), 4),
+        "p99_ms": round(percentile(ms, 99), 4),
+    }
+    result.update(extra)
+    return result
+
+
+def timed(
+    name: str,
+    fn: Callable[[], object],
+    repeat: int,
+    setup: Optional[Callable[[], None]] = None,
+) -> dict:
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return summarize(name, samples)
+
+
+def _sizes() -> Dict[str, int]:
+    conn = db.get_conn()
+    return {
+        "books": conn.execute("SELECT COALESCE(MAX(id), 0) FROM books").fetchone()[0],
+        "users": conn.execute("SELECT COALESCE(MAX(id), 0) FROM users").fetchone()[0],
+        "borrows": conn.execute("SELECT COUNT(*) FROM borrows").fetchone()[0],
+        "favorites": conn.execute("SELECT COUNT(*) FROM favorites").fetchone()[0],
+    }
+
+
+def bench_db(repeat: int, seed: int = 11) -> List[dict]:
+    rng = random.Random(seed)
+    sizes = _sizes()
+    books, users = sizes["books"], sizes["users"]
+    cold = db.invalidate_catalog
+    titles = [
+        r[0]
+        for r in db.get_conn().execute(
+            "SELECT title FROM books WHERE id IN (?, ?, ?)",
+            (books // 4 or 1, books // 2 or 1, books - 1 or 1),
+        )
+    ]
+    queries = ["night", "river gar", "tolkien", "zzzz", "compass echo"]
+    typos = ["nigth", "rivr garden", "tolkein", "compas eccho"]
+
+    results = [
+        timed("books_all", db.books_all, max(repeat // 20, 3), setup=cold),
+        timed("books_all.cached", db.books_all, repeat),
+        timed("books_page.first", lambda: db.books_page(limit=100), repeat, setup=cold),
+        timed(
+            "books_page.deep",
+            lambda: db.books_page(rng.choice(titles), books, 100),
+            repeat,
+            setup=cold,
+        ),
+        timed(
+            "books_page_before.deep",
+            lambda: db.books_page_before(rng.choice(titles), 1, 100),
+            repeat,
+            setup=cold,
+        ),
+        timed(
+            "books_search",
+            lambda: db.books_search(rng.choice(queries), 500),
+            repeat,
+            setup=cold,
+        ),
+        timed(
+            "books_search.unbounded",
+            lambda: db.books_search(rng.choice(queries)),
+            max(repeat // 10, 3),
+            setup=cold,
+        ),
+        timed(
+            "did_you_mean",
+            lambda: db.did_you_mean(rng.choice(typos)),
+            repeat,
+            setup=cold,
+        ),
+        timed(
+            "books_fuzzy",
+            lambda: db.books_fuzzy(rng.choice(typos), 500),
+            max(repeat // 10, 3),
+            setup=cold,
+        ),
+        timed("user_get", lambda: db.user_get(f"user{rng.randrange(users):07d}"), repeat),
+        timed(
+            "user_verify",
+            lambda: db.user_verify(f"user{rng.randrange(users):07d}", "password"),
+            max(repeat // 20, 3),
+        ),
+        timed(
+            "borrowed_by_user",
+            lambda: db.borrowed_by_user(rng.randint(1, users)),
+            repeat,
+        ),
+        timed(
+            "favorites_by_user",
+            lambda: db.favorites_by_user(rng.randint(1, users)),
+            repeat,
+        ),
+        timed("user_books", lambda: db.user_books(rng.randint(1, users)), repeat),
+        timed("overdue_report", db.overdue_report, max(repeat // 10, 3)),
+        timed("overdue_loans", lambda: db.overdue_loans(limit=500), max(repeat // 10, 3)),
+        timed(
+            "overdue_loans.bucket",
+            lambda: db.overdue_loans(bucket=rng.choice(db.OVERDUE_BUCKETS)[0], limit=500),
+            max(repeat // 10, 3),
+        ),
+        timed("dashboard_stats", db.dashboard_stats, max(repeat // 10, 3)),
+    ]
+
+    pairs = [(rng.randint(1, users), rng.randint(1, books)) for _ in range(repeat)]
+    it = iter(pairs)
+    results.append(timed("borrow_book", lambda: db.borrow_book(*next(it)), repeat))
+    it = iter(pairs)
+    results.append(timed("return_book", lambda: db.return_book(*next(it)), repeat))
+    batches = [
+        (rng.randint(1, users), rng.sample(range(1, books + 1), min(books, 5)))
+        for _ in range(repeat)
+    ]
+    it = iter(batches)
+    results.append(timed("borrow_books.5", lambda: db.borrow_books(*next(it)), repeat))
+    it = iter(batches)
+    results.append(timed("return_books.5", lambda: db.return_books(*next(it)), repeat))
+    it = iter(pairs)
+    results.append(timed("favorites_add", lambda: db.favorites_add(*next(it)), repeat))
+    it = iter(pairs)
+    results.append(
+        timed("favorites_remove", lambda: db.favorites_remove(*next(it)), repeat)
+    )
+
+    added: List[int] = []
+    results.append(
+        timed(
+            "add_book",
+            lambda: added.append(db.add_book("Benchmark Book", "Bench", 2024, "Bench")),
+            repeat,
+        )
+    )
+    it = iter(added)
+    results.append(timed("book_delete", lambda: db.book_delete(next(it)), repeat))
+
+    stamp = f"{time.time_ns()}"
+    it = iter(range(repeat))
+    results.append(
+        timed(
+            "user_create",
+            lambda: db.user_create(f"bench{stamp}-{next(it)}", "password"),
+            max(repeat // 20, 3),
+        )
+    )
+    results.append(bench_signin_burst(f"bench{stamp}-0", max(repeat // 5, 8)))
+    return results
+
+
+def bench_signin_burst(username: str, logins: int) -> dict:
+    service = AuthService()
+    start = time.perf_counter()
+    futures = [service.verify(username, "password") for _ in range(logins)]
+    ok = sum(1 for f in futures if f.result())
+    elapsed = time.perf_counter() - start
+    service.shutdown()
+    return {
+        "name": "auth.signin_burst",
+        "logins": logins,
+        "ok": ok,
+        "workers": service.workers,
+        "seconds": round(elapsed, 4),
+        "logins_per_sec": round(logins / elapsed, 2),
+    }
+
+
+def bench_group_commit(ops: int, threads: int = 16, durability: str = "full") -> List[dict]:
+    sizes = _sizes()
+    per_thread = max(ops // threads, 1)
+
+    def burst(name: str, add, remove, setup=None) -> dict:
+        def worker(seed):
+            if setup:
+                setup()
+            rng = random.Random(seed)
+            pairs = [
+                (rng.randint(1, sizes["users"]), rng.randint(1, sizes["books"]))
+                for _ in range(per_thread)
+            ]
+            for pair in pairs:
+                add(*pair)
+            for pair in pairs:
+                remove(*pair)
+
+        workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+        start = time.perf_counter()
+        for t in workers:
+            t.start()
+        for t in workers:
+            t.join()
+        elapsed = time.perf_counter() - start
+        total = per_thread * threads * 2
+        return {
+            "name": name,
+            "threads": threads,
+            "operations": total,
+            "durability": durability,
+            "seconds": round(elapsed, 4),
+            "ops_per_sec": round(total / elapsed, 2),
+        }
+
+    results = [
+        burst(
+            "favorites.direct",
+            db.favorites_add,
+            db.favorites_remove,
+            setup=lambda: db.get_conn().execute(f"PRAGMA synchronous = {durability}"),
+        )
+    ]
+    writer = GroupCommitWriter(durability=durability)
+    results.append(
+        burst(
+            "favorites.group_commit",
+            lambda *a: writer.favorites_add(*a).result(),
+            lambda *a: writer.favorites_remove(*a).result(),
+        )
+    )
+    writer.close()
+    results[-1]["batches"] = writer.batches
+    return results
+
+
+def bench_autocomplete(repeat: int, seed: int = 5) -> List[dict]:
+    rng = random.Random(seed)
+    index = autocomplete.AutocompleteIndex()
+    start = time.perf_counter()
+    index.build()
+    build = time.perf_counter() - start
+    stats = index.stats()
+
+    books = _sizes()["books"]
+    ids = [rng.randint(1, books) for _ in range(1000)] if books else []
+    titles = [
+        r[0]
+        for r in db.get_conn().execute(
+            "SELECT title FROM books WHERE id IN (SELECT value FROM json_each(?))",
+            (json.dumps(ids),),
+        )
+    ]
+    prefixes = [t[: rng.randint(1, 8)] for t in titles] or ["a"]
+    return [
+        {
+            "name": "autocomplete.build",
+            "seconds": round(build, 4),
+            "terms": stats["terms"],
+            "cached_prefixes": stats["cached_prefixes"],
+            "memory_mb": round(stats["memory_bytes"] / 2**20, 2),
+            "bytes_per_term": round(stats["memory_bytes"] / max(stats["terms"], 1), 1),
+        },
+        timed("autocomplete.complete", lambda: index.complete(rng.choice(prefixes)), repeat),
+    ]
+
+
+def check_table_binding(root, rounds: int = 200, seed: int = 9) -> dict:
+    # Regression check: after any reorder the Treeview must show exactly the
+    # new order, including rows that move down (Treeview.move index quirk).
+    from tkinter import ttk
+    from Pages.table_binding import TableBinding
+
+    rng = random.Random(seed)
+    table = ttk.Treeview(root)
+    binding = TableBinding(table, values=lambda row: row)
+    cases = [(list("ABCD"), list("BCAD"))]
+    for _ in range(rounds):
+        cases.append(
+            (rng.sample(range(40), rng.randint(0, 30)), rng.sample(range(40), rng.randint(0, 30)))
+        )
+    failed = 0
+    for old, new in cases:
+        binding.apply([(k,) for k in old])
+        binding.apply([(k,) for k in new])
+        failed += list(table.get_children()) != [str(k) for k in new]
+    table.destroy()
+    return {"name": "ui.table_binding.order", "cases": len(cases), "failed": failed}
+
+
+def bench_ui(repeat: int) -> List[dict]:
+    try:
+        import tkinter as tk
+
+        root = tk.Tk()
+    except Exception as e:
+        return [{"name": "ui", "skipped": f"no display: {e}"}]
+
+    from Pages.library import LibraryPage
+    from Pages.profile import ProfilePage
+
+    root.withdraw()
+    conn = db.get_conn()
+    user = conn.execute(
+        "SELECT user_id, COUNT(*) AS n FROM favorites GROUP BY user_id ORDER BY n DESC LIMIT 1"
+    ).fetchone()
+    current_user = (user[0], "bench") if user else None
+
+    library = LibraryPage(root, current_user)
+    profile = ProfilePage(root, current_user)
+    rows = db.books_search("night", 500)
+
+    def settle(fn):
+        def run():
+            fn()
+            root.update_idletasks()
+
+        return run
+
+    results = [
+        timed("ui.library.reset", settle(library.pager.reset), repeat),
+        timed("ui.library.refresh", settle(library.pager.refresh), repeat),
+        timed(
+            "ui.library.show_search",
+            settle(lambda: (library.pager.show(rows), library.pager.show([]))),
+            repeat,
+        ),
+        timed("ui.profile.refresh", settle(profile.refresh_books), repeat),
+        check_table_binding(root),
+    ]
+    root.destroy()
+    return results
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return (
+            subprocess.check_output(
+                ["git", "rev-parse", "--short", "HEAD"],
+                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                stderr=subprocess.DEVNULL,
+            )
+            .decode()
+            .strip()
+        )
+    except Exception:
+        return None
+
+
+def compare(old_path: str, new_path: str):
+    with open(old_path) as f:
+        old = {r["name"]: r for r in json.load(f)["results"]}
+    with open(new_path) as f:
+        new = json.load(f)["results"]
+    for r in new:
+        before = old.get(r["name"])
+        if not before or "p50_ms" not in r or "p50_ms" not in before:
+            continue
+        change = (r["p50_ms"] - before["p50_ms"]) / before["p50_ms"] * 100 if before["p50_ms"] else 0.0
+        print(
+            f"{r['name']:32} p50 {before['p50_ms']:10.4f} -> {r['p50_ms']:10.4f} ms ({change:+.1f}%)"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Library Manager benchmark suite")
+    parser.add_argument("--db", help="benchmark a copy of an existing database")
+    parser.add_argument(
+        "--in-place", action="store_true", help="run against --db itself instead of a copy"
+    )
+    parser.add_argument("--scale", choices=sorted(generate.SCALES), default="small")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--no-ui", action="store_true")
+    parser.add_argument("--output", help="write JSON results to this file")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"))
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return 0
+
+    meta = {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+    }
+    if args.db:
+        if not os.path.exists(args.db):
+            parser.error(f"database not found: {args.db}")
+        db.DB_PATH = args.db if args.in_place else generate.copy_db(args.db)
+        db.init_db()
+    else:
+        db.DB_PATH = os.path.join(tempfile.mkdtemp(prefix="bench-"), "bench.db")
+        meta["generate_seconds"] = generate.generate(**generate.SCALES[args.scale])
+        meta["scale"] = args.scale
+    meta["sizes"] = _sizes()
+
+    results = bench_db(args.repeat)
+    results.extend(bench_group_commit(args.repeat * 4))
+    results.extend(bench_autocomplete(args.repeat * 10))
+    results.extend(bench_export())
+    if not args.no_ui:
+        results.extend(bench_ui(max(args.repeat // 10, 5)))
+
+    report = {"meta": meta, "results": results}
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
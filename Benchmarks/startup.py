@@ -0,0 +1,96 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from typing import List
+
+from Data import db
+from Benchmarks import generate
+from Benchmarks.run import summarize
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+import main
+
+imported = time.perf_counter()
+main.db.DB_PATH = sys.argv[1]
+if main.db.db_exists():
+    main.db.init_db()
+    phase = "init_db"
+else:
+    main.db.init_db(seed_books=main.db.SEED_PATH)
+    phase = "init_db.first_run"
+ready = time.perf_counter()
+result = {"import": imported - start, phase: ready - imported}
+if len(sys.argv) > 2:
+    print(json.dumps(result))
+    sys.exit(0)
+
+try:
+    root = main.tk.Tk()
+except Exception as e:
+    result["skipped"] = f"no display: {e}"
+else:
+    user = main.db.get_conn().execute("SELECT id, username FROM users LIMIT 1").fetchone()
+    main._start_main_app(root, *(user or (1, "bench")))
+    app = root.winfo_children()[0]
+    while not app.winfo_viewable():
+        root.update()
+    root.update_idletasks()
+    result["first_paint"] = time.perf_counter() - start
+    root.update()
+    result["data_loaded"] = time.perf_counter() - start
+    root.destroy()
+print(json.dumps(result))
+"""
+
+
+def _child(*args) -> dict:
+    out = subprocess.check_output([sys.executable, "-c", CHILD, *args], cwd=ROOT)
+    return json.loads(out.decode().strip().splitlines()[-1])
+
+
+def bench_startup(path: str, runs: int) -> List[dict]:
+    samples, skipped = {}, None
+    for _ in range(runs):
+        result = _child(path)
+        skipped = result.pop("skipped", None)
+        for key, value in result.items():
+            samples.setdefault(key, []).append(value)
+    for _ in range(runs):
+        fresh = os.path.join(tempfile.mkdtemp(prefix="startup-seed-"), "library.db")
+        result = _child(fresh, "--no-ui")
+        samples.setdefault("init_db.first_run", []).append(result["init_db.first_run"])
+    results = [summarize(f"startup.{key}", values) for key, values in samples.items()]
+    if skipped:
+        results.append({"name": "startup.first_paint", "skipped": skipped})
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cold-start benchmark for main.py")
+    parser.add_argument("--db", help="existing database to open")
+    parser.add_argument("--scale", choices=sorted(generate.SCALES), default="small")
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    if args.db:
+        path = args.db
+    else:
+        path = os.path.join(tempfile.mkdtemp(prefix="startup-bench-"), "bench.db")
+        db.DB_PATH = path
+        generate.generate(**generate.SCALES[args.scale])
+        db.close_conn()
+
+    print(json.dumps(bench_startup(path, args.runs), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1 +1,12 @@
-__all__ = ["books", "db"]
+__all__ = [
+    "adb",
+    "auth",
+    "autocomplete",
+    "columns",
+    "db",
+    "exporter",
+    "importer",
+    "metrics",
+    "migrations",
+    "passwords",
+]
@@ -0,0 +1,136 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, List, Optional, Tuple
+
+from Data import db, exporter, passwords
+
+READERS = 8
+
+_lock = threading.Lock()
+_readers: Optional[ThreadPoolExecutor] = None
+_writer: Optional[ThreadPoolExecutor] = None
+
+
+def _pools() -> Tuple[ThreadPoolExecutor, ThreadPoolExecutor]:
+    global _readers, _writer
+    with _lock:
+        if _readers is None:
+            _readers = ThreadPoolExecutor(max_workers=READERS, thread_name_prefix="adb-read")
+            _writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="adb-write")
+        return _readers, _writer
+
+
+def shutdown(wait: bool = True):
+    global _readers, _writer
+    with _lock:
+        readers, writer = _readers, _writer
+        _readers = _writer = None
+    if readers is not None:
+        readers.shutdown(wait=wait)
+        writer.shutdown(wait=wait)
+
+
+async def _run(write: bool, fn, *args, **kwargs):
+    readers, writer = _pools()
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        writer if write else readers, functools.partial(fn, *args, **kwargs)
+    )
+
+
+def _wrap(fn, write: bool):
+    name = fn.__name__
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        return await _run(write, getattr(db, name), *args, **kwargs)
+
+    return wrapper
+
+
+def _read(fn):
+    return _wrap(fn, False)
+
+
+def _write(fn):
+    return _wrap(fn, True)
+
+
+init_db = _write(db.init_db)
+
+user_create = _write(db.user_create)
+user_get = _read(db.user_get)
+user_check = _read(db.user_check)
+user_rehash = _write(db.user_rehash)
+
+
+async def user_verify(username: str, password: str) -> Optional[int]:
+    # scrypt runs on a reader; only upgrading an old hash needs the writer.
+    row = await user_check(username, password)
+    if not row:
+        return None
+    uid, password_hash = row
+    if passwords.needs_rehash(password_hash):
+        new_hash = await _run(False, passwords.hash_password, password)
+        await user_rehash(uid, password_hash, new_hash)
+    return uid
+
+
+books_all = _read(db.books_all)
+books_page = _read(db.books_page)
+books_page_before = _read(db.books_page_before)
+books_search = _read(db.books_search)
+books_fuzzy = _read(db.books_fuzzy)
+did_you_mean = _read(db.did_you_mean)
+add_book = _write(db.add_book)
+book_set_copies = _write(db.book_set_copies)
+book_delete = _write(db.book_delete)
+inventory_rebuild = _write(db.inventory_rebuild)
+
+borrow_books = _write(db.borrow_books)
+borrow_book = _write(db.borrow_book)
+return_books = _write(db.return_books)
+return_book = _write(db.return_book)
+borrowed_by_user = _read(db.borrowed_by_user)
+user_books = _read(db.user_books)
+
+overdue_report = _read(db.overdue_report)
+overdue_loans = _read(db.overdue_loans)
+dashboard_stats = _read(db.dashboard_stats)
+stats_rebuild = _write(db.stats_rebuild)
+stats_verify = _read(db.stats_verify)
+
+favorites_add = _write(db.favorites_add)
+favorites_remove = _write(db.favorites_remove)
+favorites_by_user = _read(db.favorites_by_user)
+
+
+_books_page_uncached = db.books_page.__wrapped__
+
+
+async def iter_books(batch_size: int = 500) -> AsyncIterator[List[Tuple]]:
+    after_title = after_id = None
+    while True:
+        rows = await _run(False, _books_page_uncached, after_title, after_id, batch_size)
+        if not rows:
+            return
+        yield rows
+        if len(rows) < batch_size:
+            return
+        after_title, after_id = rows[-1][1], rows[-1][0]
+
+
+async def iter_rows(kind: str, batch_size: int = 1000) -> AsyncIterator[List[Tuple]]:
+    _, sql = exporter.EXPORTS[kind]
+    conn = await _run(False, exporter._read_conn, check_same_thread=False)
+    try:
+        cur = await _run(False, conn.execute, sql)
+        while True:
+            rows = await _run(False, cur.fetchmany, batch_size)
+            if not rows:
+                return
+            yield rows
+    finally:
+        await _run(False, conn.close)
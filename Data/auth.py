@@ -0,0 +1,32 @@
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+
+from Data import db
+
+
+class AuthService:
+    def __init__(self, max_workers: Optional[int] = None):
+        self.workers = max_workers or os.cpu_count() or 1
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="auth"
+        )
+
+    def verify(self, username: str, password: str) -> Future:
+        return self.executor.submit(db.user_verify, username, password)
+
+    def create(self, username: str, password: str) -> Future:
+        return self.executor.submit(db.user_create, username, password)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
+
+
+_service: Optional[AuthService] = None
+
+
+def get_service() -> AuthService:
+    global _service
+    if _service is None:
+        _service = AuthService()
+    return _service
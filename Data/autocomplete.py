@@ -0,0 +1,298 @@
+import heapq
+import sys
+import threading
+import unicodedata
+from array import array
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Tuple
+
+from Data import db
+
+KINDS = ("title", "author", "category")
+TOP_K = 8
+MAX_TERMS = 2_000_000
+MAX_LABEL = 120
+SCAN_LIMIT = 256
+END = chr(0x10FFFF)
+
+GROUP_SQL = "SELECT {0}, COUNT(*) FROM books WHERE {0} <> '' GROUP BY {0}"
+LOANS_SQL = "SELECT b.title, b.author, b.category, s.loans FROM stats_book_loans s JOIN books b ON b.id = s.book_id WHERE s.loans > 0"
+
+
+def normalize(text: str) -> str:
+    text = text.casefold()
+    if text.isascii():
+        return text
+    return "".join(
+        c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c)
+    )
+
+
+def _key(kind: int, label: str) -> str:
+    label = label.strip()[:MAX_LABEL]
+    return f"{normalize(label)}\x00{kind}{label}"
+
+
+def _split(key: str) -> Tuple[str, str]:
+    sep = key.index("\x00")
+    return KINDS[int(key[sep + 1])], key[sep + 2 :]
+
+
+class _Keys:
+    __slots__ = ("index",)
+
+    def __init__(self, index: "AutocompleteIndex"):
+        self.index = index
+
+    def __len__(self) -> int:
+        return len(self.index._kinds)
+
+    def __getitem__(self, i: int) -> str:
+        return self.index._key(i)
+
+
+class AutocompleteIndex:
+    def __init__(self, max_terms: int = MAX_TERMS):
+        self.max_terms = max_terms
+        self.dropped = 0
+        self.ready = False
+        self._lock = threading.RLock()
+        self._building = False
+        self._stale = False
+        self._load([], {}, {})
+
+    def __len__(self) -> int:
+        return self._live
+
+    def _key(self, i: int) -> str:
+        label = self._blob[self._offsets[i] : self._offsets[i + 1]].decode()
+        return f"{normalize(label)}\x00{self._kinds[i]}{label}"
+
+    def _load(self, keys: List[str], weights: Dict[str, int], counts: Dict[str, int]):
+        labels = [key[key.index("\x00") + 2 :].encode() for key in keys]
+        offsets = array("I", [0])
+        total = 0
+        for label in labels:
+            total += len(label)
+            offsets.append(total)
+        self._blob = b"".join(labels)
+        self._offsets = offsets
+        self._kinds = bytes(int(key[key.index("\x00") + 1]) for key in keys)
+        self._weights = array("i", [weights.get(key, 0) for key in keys])
+        self._counts = array("i", [counts[key] for key in keys])
+        self._extra: List[str] = []
+        self._extra_counts: Dict[str, int] = {}
+        self._top: Dict[str, array] = {}
+        self._live = len(keys)
+        self._warm(keys)
+
+    def _warm(self, keys: List[str], lo: int = 0, hi: Optional[int] = None, n: int = 0) -> array:
+        hi = len(keys) if hi is None else hi
+        candidates: List[int] = []
+        i = lo
+        while i < hi:
+            if keys[i][n] == "\x00":
+                candidates.append(i)
+                i += 1
+                continue
+            child = keys[i][: n + 1]
+            j = bisect_left(keys, child + END, i, hi)
+            if j - i > SCAN_LIMIT:
+                best = self._top[child] = self._warm(keys, i, j, n + 1)
+            else:
+                best = self._scan(i, j)
+            candidates.extend(best)
+            i = j
+        return self._rank(candidates)
+
+    def build(self):
+        conn = db.get_conn()
+        counts: Dict[str, int] = {}
+        for kind, column in enumerate(KINDS):
+            for label, count in conn.execute(GROUP_SQL.format(column)):
+                key = _key(kind, label)
+                counts[key] = counts.get(key, 0) + count
+        weights: Dict[str, int] = {}
+        for row in conn.execute(LOANS_SQL):
+            for kind, label in enumerate(row[:3]):
+                if label:
+                    key = _key(kind, label)
+                    weights[key] = weights.get(key, 0) + row[3]
+
+        dropped = max(len(counts) - self.max_terms, 0)
+        if dropped:
+            keys = heapq.nlargest(
+                self.max_terms, counts, key=lambda k: (weights.get(k, 0), counts[k])
+            )
+            keys.sort()
+        else:
+            keys = sorted(counts)
+
+        with self._lock:
+            self._load(keys, weights, counts)
+            self.dropped = dropped
+            self.ready = True
+
+    def _rank(self, candidates, k: int = TOP_K) -> array:
+        weights, counts = self._weights, self._counts
+        live = (i for i in candidates if counts[i] > 0)
+        return array("i", heapq.nlargest(k, live, key=lambda i: (weights[i], counts[i], -i)))
+
+    def _scan(self, lo: int, hi: int, k: int = TOP_K) -> array:
+        return self._rank(range(lo, hi), k)
+
+    def _find(self, key: str) -> int:
+        i = bisect_left(_Keys(self), key)
+        if i < len(self._kinds) and self._key(i) == key:
+            return i
+        return -1
+
+    def _changed(self, key: str, i: int, removed: bool):
+        norm = key[: key.index("\x00")]
+        rank = (self._weights[i], self._counts[i], -i)
+        for n in range(1, len(norm) + 1):
+            best = self._top.get(norm[:n])
+            if best is None:
+                continue
+            if removed:
+                stale = i in best
+            else:
+                last = best[-1] if best else 0
+                stale = len(best) < TOP_K or rank > (
+                    self._weights[last],
+                    self._counts[last],
+                    -last,
+                )
+            if stale:
+                del self._top[norm[:n]]
+
+    def _add(self, key: str):
+        i = self._find(key)
+        if i >= 0:
+            self._live += self._counts[i] == 0
+            self._counts[i] += 1
+            self._changed(key, i, False)
+        elif key in self._extra_counts:
+            self._extra_counts[key] += 1
+        elif self._live >= self.max_terms:
+            self.dropped += 1
+        else:
+            self._extra_counts[key] = 1
+            insort(self._extra, key)
+            self._live += 1
+
+    def _remove(self, key: str):
+        i = self._find(key)
+        if i >= 0 and self._counts[i] > 0:
+            self._changed(key, i, True)
+            self._counts[i] -= 1
+            self._live -= self._counts[i] == 0
+        elif key in self._extra_counts:
+            self._extra_counts[key] -= 1
+            if not self._extra_counts[key]:
+                del self._extra_counts[key]
+                del self._extra[bisect_left(self._extra, key)]
+                self._live -= 1
+
+    def _rebuild(self):
+        try:
+            while True:
+                with self._lock:
+                    self._stale = False
+                try:
+                    self.build()
+                except Exception:
+                    with self._lock:
+                        self.ready = self._building = False
+                    return
+                with self._lock:
+                    if not self._stale:
+                        self._building = False
+                        return
+        finally:
+            db.close_conn()
+
+    def on_books_changed(self, event: str, row: Optional[Tuple]):
+        with self._lock:
+            if event == "reset" or self._building:
+                self._stale = True
+                if self.ready and not self._building:
+                    self._building = True
+                    threading.Thread(
+                        target=self._rebuild, name="autocomplete-rebuild", daemon=True
+                    ).start()
+                return
+            if not self.ready:
+                return
+            for kind, label in enumerate(row[1:4]):
+                if label:
+                    if event == "add":
+                        self._add(_key(kind, label))
+                    else:
+                        self._remove(_key(kind, label))
+
+    def complete(self, prefix: str, k: int = TOP_K) -> List[Tuple[str, str, int]]:
+        norm = normalize(prefix.strip())
+        if not norm:
+            return []
+        with self._lock:
+            best = self._top.get(norm) if k <= TOP_K else None
+            if best is None:
+                keys = _Keys(self)
+                lo = bisect_left(keys, norm)
+                hi = bisect_left(keys, norm + END, lo)
+                best = self._scan(lo, hi, max(k, TOP_K))
+                if hi - lo > SCAN_LIMIT and k <= TOP_K:
+                    self._top[norm] = best
+            found = [(-self._weights[i], -self._counts[i], self._key(i)) for i in best]
+            lo = bisect_left(self._extra, norm)
+            hi = bisect_left(self._extra, norm + END, lo)
+            found.extend((0, -self._extra_counts[key], key) for key in self._extra[lo:hi])
+            found.sort()
+            return [_split(key) + (-weight,) for weight, _, key in found[:k]]
+
+    def memory_bytes(self) -> int:
+        with self._lock:
+            return (
+                sys.getsizeof(self._blob)
+                + sys.getsizeof(self._offsets)
+                + sys.getsizeof(self._kinds)
+                + sys.getsizeof(self._weights)
+                + sys.getsizeof(self._counts)
+                + sys.getsizeof(self._extra)
+                + sum(sys.getsizeof(key) for key in self._extra)
+                + sys.getsizeof(self._extra_counts)
+                + sys.getsizeof(self._top)
+                + sum(sys.getsizeof(p) + sys.getsizeof(t) for p, t in self._top.items())
+            )
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "terms": len(self),
+                "added": len(self._extra),
+                "dropped": self.dropped,
+                "max_terms": self.max_terms,
+                "cached_prefixes": len(self._top),
+                "memory_bytes": self.memory_bytes(),
+            }
+
+
+_index: Optional[AutocompleteIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_index() -> AutocompleteIndex:
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = AutocompleteIndex()
+            db.add_book_listener(_index.on_books_changed)
+        index = _index
+    if not index.ready:
+        index.build()
+    return index
+
+
+def complete(prefix: str, k: int = TOP_K) -> List[Tuple[str, str, int]]:
+    return get_index().complete(prefix, k)
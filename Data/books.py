@@ -1,635 +0,0 @@
-books = [
-    ("Atomic Habits", "James Clear", 2018, "Self-help", "A guide to build good habits"),
-    (
-        "Python Crash Course",
-        "Eric Matthes",
-        2019,
-        "Programming",
-        "Hands-on Python project book",
-    ),
-    (
-        "Clean Code",
-        "Robert C. Martin",
-        2008,
-        "Programming",
-        "A handbook of Agile software craftsmanship",
-    ),
-    ("The Hobbit", "J.R.R. Tolkien", 1937, "Fantasy", "Bilbo Baggins' adventure"),
-    (
-        "The Pragmatic Programmer",
-        "Andrew Hunt & David Thomas",
-        1999,
-        "Programming",
-        "Philosophy of pragmatic software development",
-    ),
-    (
-        "Deep Work",
-        "Cal Newport",
-        2016,
-        "Self-help",
-        "Focus and productivity in a distracted world",
-    ),
-    (
-        "The Art of War",
-        "Sun Tzu",
-        -500,
-        "Strategy",
-        "Ancient treatise on military strategy and tactics",
-    ),
-    (
-        "1984",
-        "George Orwell",
-        1949,
-        "Dystopian",
-        "Totalitarian society under Big Brother",
-    ),
-    (
-        "Brave New World",
-        "Aldous Huxley",
-        1932,
-        "Dystopian",
-        "Future society controlled by technology and conditioning",
-    ),
-    (
-        "Fahrenheit 451",
-        "Ray Bradbury",
-        1953,
-        "Dystopian",
-        "Book burning society and censorship",
-    ),
-    (
-        "To Kill a Mockingbird",
-        "Harper Lee",
-        1960,
-        "Classic",
-        "Racial injustice in American South",
-    ),
-    (
-        "The Great Gatsby",
-        "F. Scott Fitzgerald",
-        1925,
-        "Classic",
-        "Jazz Age, wealth, and the American dream",
-    ),
-    ("Moby Dick", "Herman Melville", 1851, "Classic", "A whaling voyage and obsession"),
-    (
-        "Crime and Punishment",
-        "Fyodor Dostoevsky",
-        1866,
-        "Classic",
-        "Moral dilemmas and redemption",
-    ),
-    (
-        "War and Peace",
-        "Leo Tolstoy",
-        1869,
-        "Classic",
-        "Epic novel of Russian society and war",
-    ),
-    (
-        "Harry Potter and the Philosopher's Stone",
-        "J.K. Rowling",
-        1997,
-        "Fantasy",
-        "The beginning of Harry's magical journey",
-    ),
-    (
-        "Harry Potter and the Chamber of Secrets",
-        "J.K. Rowling",
-        1998,
-        "Fantasy",
-        "Secrets and dangers in Hogwarts second year",
-    ),
-    (
-        "Harry Potter and the Prisoner of Azkaban",
-        "J.K. Rowling",
-        1999,
-        "Fantasy",
-        "Sirius Black escapes prison",
-    ),
-    (
-        "Harry Potter and the Goblet of Fire",
-        "J.K. Rowling",
-        2000,
-        "Fantasy",
-        "Triwizard Tournament and rising danger",
-    ),
-    (
-        "Harry Potter and the Order of the Phoenix",
-        "J.K. Rowling",
-        2003,
-        "Fantasy",
-        "Resistance against dark forces grows",
-    ),
-    (
-        "Harry Potter and the Half-Blood Prince",
-        "J.K. Rowling",
-        2005,
-        "Fantasy",
-        "Secrets of the past unveiled",
-    ),
-    (
-        "Harry Potter and the Deathly Hallows",
-        "J.K. Rowling",
-        2007,
-        "Fantasy",
-        "Final battle against evil",
-    ),
-    (
-        "The Alchemist",
-        "Paulo Coelho",
-        1988,
-        "Fiction",
-        "A shepherd's journey to find treasure and destiny",
-    ),
-    (
-        "The Hunger Games",
-        "Suzanne Collins",
-        2008,
-        "Dystopian",
-        "Fight for survival in dystopian arena",
-    ),
-    (
-        "Catching Fire",
-        "Suzanne Collins",
-        2009,
-        "Dystopian",
-        "Consequences of rebellion begin",
-    ),
-    (
-        "Mockingjay",
-        "Suzanne Collins",
-        2010,
-        "Dystopian",
-        "Final war against oppressive regime",
-    ),
-    (
-        "The Fault in Our Stars",
-        "John Green",
-        2012,
-        "Contemporary",
-        "Teen love and illness",
-    ),
-    (
-        "Dune",
-        "Frank Herbert",
-        1965,
-        "Science Fiction",
-        "Desert planet and interstellar politics",
-    ),
-    (
-        "The Lord of the Rings: The Fellowship of the Ring",
-        "J.R.R. Tolkien",
-        1954,
-        "Fantasy",
-        "The beginning of the quest to destroy the Ring",
-    ),
-    (
-        "The Lord of the Rings: The Two Towers",
-        "J.R.R. Tolkien",
-        1954,
-        "Fantasy",
-        "Battle and hardship on the journey",
-    ),
-    (
-        "The Lord of the Rings: The Return of the King",
-        "J.R.R. Tolkien",
-        1955,
-        "Fantasy",
-        "Final battle for Middle-earth",
-    ),
-    (
-        "The Silmarillion",
-        "J.R.R. Tolkien",
-        1977,
-        "Fantasy",
-        "Mythical history of Middle-earth",
-    ),
-    (
-        "The Shining",
-        "Stephen King",
-        1977,
-        "Horror",
-        "Haunted hotel and psychological horror",
-    ),
-    ("It", "Stephen King", 1986, "Horror", "Evil clown terrorizes children"),
-    ("Misery", "Stephen King", 1987, "Thriller", "Writer held captive by obsession"),
-    ("Carrie", "Stephen King", 1974, "Horror", "Teen girl with telekinetic powers"),
-    (
-        "The Stand",
-        "Stephen King",
-        1978,
-        "Post-apocalyptic",
-        "Battle between good and evil survivors",
-    ),
-    (
-        "Think and Grow Rich",
-        "Napoleon Hill",
-        1937,
-        "Self-help",
-        "Principles for wealth and success",
-    ),
-    (
-        "Rich Dad Poor Dad",
-        "Robert Kiyosaki",
-        1997,
-        "Finance",
-        "Lessons on money and investing",
-    ),
-    (
-        "The 48 Laws of Power",
-        "Robert Greene",
-        1998,
-        "Strategy",
-        "Psychology and strategy of power",
-    ),
-    (
-        "Mastery",
-        "Robert Greene",
-        2012,
-        "Self-help",
-        "How to achieve mastery in your field",
-    ),
-    (
-        "Meditations",
-        "Marcus Aurelius",
-        180,
-        "Philosophy",
-        "Stoic reflections and life guidance",
-    ),
-    (
-        "The Power of Now",
-        "Eckhart Tolle",
-        1997,
-        "Spirituality",
-        "Living in the present moment",
-    ),
-    (
-        "Sapiens: A Brief History of Humankind",
-        "Yuval Noah Harari",
-        2011,
-        "History",
-        "Evolution of humanity",
-    ),
-    (
-        "Homo Deus: A Brief History of Tomorrow",
-        "Yuval Noah Harari",
-        2015,
-        "Futurology",
-        "Possible futures of humankind",
-    ),
-    (
-        "12 Rules for Life",
-        "Jordan Peterson",
-        2018,
-        "Self-help",
-        "Rules to find meaning and responsibility",
-    ),
-    ("Beyond Order", "Jordan Peterson", 2021, "Self-help", "Balancing order and chaos"),
-    (
-        "The Subtle Art of Not Giving a F*ck",
-        "Mark Manson",
-        2016,
-        "Self-help",
-        "A counterintuitive approach to living",
-    ),
-    (
-        "Everything Is F*cked: A Book About Hope",
-        "Mark Manson",
-        2019,
-        "Self-help",
-        "Hope and meaning in troubled times",
-    ),
-    (
-        "The Catcher in the Rye",
-        "J.D. Salinger",
-        1951,
-        "Classic",
-        "Teen angst and alienation",
-    ),
-    (
-        "The Grapes of Wrath",
-        "John Steinbeck",
-        1939,
-        "Classic",
-        "Great Depression and social injustice",
-    ),
-    (
-        "Of Mice and Men",
-        "John Steinbeck",
-        1937,
-        "Classic",
-        "Friendship and loneliness during hardship",
-    ),
-    (
-        "Animal Farm",
-        "George Orwell",
-        1945,
-        "Dystopian",
-        "Political satire of totalitarianism",
-    ),
-    (
-        "Lord of the Flies",
-        "William Golding",
-        1954,
-        "Allegory",
-        "Children stranded create a society",
-    ),
-    (
-        "Jane Eyre",
-        "Charlotte Brontë",
-        1847,
-        "Classic",
-        "A woman’s struggle for freedom and love",
-    ),
-    (
-        "Wuthering Heights",
-        "Emily Brontë",
-        1847,
-        "Classic",
-        "Love and revenge on the moors",
-    ),
-    (
-        "Pride and Prejudice",
-        "Jane Austen",
-        1813,
-        "Classic",
-        "Love, society, and misunderstandings",
-    ),
-    (
-        "Sense and Sensibility",
-        "Jane Austen",
-        1811,
-        "Classic",
-        "Sibling relationships and social pressure",
-    ),
-    (
-        "The Chronicles of Narnia: The Lion, the Witch and the Wardrobe",
-        "C.S. Lewis",
-        1950,
-        "Fantasy",
-        "Children's magical journey to Narnia",
-    ),
-    (
-        "The Chronicles of Narnia: Prince Caspian",
-        "C.S. Lewis",
-        1951,
-        "Fantasy",
-        "Return to Narnia, war and faith",
-    ),
-    (
-        "The Chronicles of Narnia: The Voyage of the Dawn Treader",
-        "C.S. Lewis",
-        1952,
-        "Fantasy",
-        "Sea journey and adventures",
-    ),
-    (
-        "The Chronicles of Narnia: The Silver Chair",
-        "C.S. Lewis",
-        1953,
-        "Fantasy",
-        "Underworld journey and rescue mission",
-    ),
-    (
-        "The Chronicles of Narnia: The Horse and His Boy",
-        "C.S. Lewis",
-        1954,
-        "Fantasy",
-        "Runaway boy’s escape to freedom",
-    ),
-    (
-        "The Chronicles of Narnia: The Magician's Nephew",
-        "C.S. Lewis",
-        1955,
-        "Fantasy",
-        "Origins of Narnia and creation myths",
-    ),
-    (
-        "The Chronicles of Narnia: The Last Battle",
-        "C.S. Lewis",
-        1956,
-        "Fantasy",
-        "Final conflict in Narnia",
-    ),
-    (
-        "Slaughterhouse-Five",
-        "Kurt Vonnegut",
-        1969,
-        "Science Fiction",
-        "Time-traveling WWII survivor",
-    ),
-    (
-        "Dune Messiah",
-        "Frank Herbert",
-        1969,
-        "Science Fiction",
-        "After the rise of emperor Paul Atreides",
-    ),
-    (
-        "Children of Dune",
-        "Frank Herbert",
-        1976,
-        "Science Fiction",
-        "Power struggles in desert empire",
-    ),
-    (
-        "Foundation",
-        "Isaac Asimov",
-        1951,
-        "Science Fiction",
-        "Rise and fall of galactic empire",
-    ),
-    (
-        "Foundation and Empire",
-        "Isaac Asimov",
-        1952,
-        "Science Fiction",
-        "Galactic politics and rebellion",
-    ),
-    (
-        "Second Foundation",
-        "Isaac Asimov",
-        1953,
-        "Science Fiction",
-        "Search for hidden guardians of humanity",
-    ),
-    (
-        "Brave New World Revisited",
-        "Aldous Huxley",
-        1958,
-        "Philosophy",
-        "Essays on the modern world & dystopia",
-    ),
-    (
-        "Man’s Search for Meaning",
-        "Viktor E. Frankl",
-        1946,
-        "Psychology",
-        "Holocaust memoir and search for purpose",
-    ),
-    (
-        "The Road",
-        "Cormac McCarthy",
-        2006,
-        "Post-apocalyptic",
-        "Father and son surviving in a bleak world",
-    ),
-    (
-        "The Kite Runner",
-        "Khaled Hosseini",
-        2003,
-        "Historical Fiction",
-        "Friendship, guilt, and redemption in Afghanistan",
-    ),
-    (
-        "A Thousand Splendid Suns",
-        "Khaled Hosseini",
-        2007,
-        "Historical Fiction",
-        "Women’s struggle in war‑torn Afghanistan",
-    ),
-    (
-        "The Book Thief",
-        "Markus Zusak",
-        2005,
-        "Historical Fiction",
-        "Girl, books and war in Nazi Germany",
-    ),
-    (
-        "Life of Pi",
-        "Yann Martel",
-        2001,
-        "Adventure",
-        "Survival at sea with a Bengal tiger",
-    ),
-    (
-        "The Da Vinci Code",
-        "Dan Brown",
-        2003,
-        "Thriller",
-        "Secret societies and religious mysteries",
-    ),
-    (
-        "Angels & Demons",
-        "Dan Brown",
-        2000,
-        "Thriller",
-        "Ancient conspiracies in modern world",
-    ),
-    (
-        "The Girl with the Dragon Tattoo",
-        "Stieg Larsson",
-        2005,
-        "Mystery",
-        "Dark secrets and investigation",
-    ),
-    (
-        "The Girl Who Played with Fire",
-        "Stieg Larsson",
-        2006,
-        "Mystery",
-        "Crime and corruption exposed",
-    ),
-    (
-        "The Girl Who Kicked the Hornets' Nest",
-        "Stieg Larsson",
-        2007,
-        "Mystery",
-        "Final unraveling of shocking truths",
-    ),
-    ("Gone Girl", "Gillian Flynn", 2012, "Thriller", "Marriage, deception and mystery"),
-    (
-        "The Alchemist’s Daughter",
-        "Melly Savage",
-        2018,
-        "Fantasy",
-        "Magic, betrayal and redemption",
-    ),  # example fictional
-    (
-        "Educated",
-        "Tara Westover",
-        2018,
-        "Memoir",
-        "From isolated childhood to earning a PhD",
-    ),
-    ("Becoming", "Michelle Obama", 2018, "Memoir", "Journey of a former First Lady"),
-    (
-        "The Power of Habit",
-        "Charles Duhigg",
-        2012,
-        "Self-help",
-        "Why habits exist and how to change them",
-    ),
-    (
-        "Thinking, Fast and Slow",
-        "Daniel Kahneman",
-        2011,
-        "Psychology",
-        "Two systems of thinking",
-    ),
-    (
-        "Outliers",
-        "Malcolm Gladwell",
-        2008,
-        "Non-fiction",
-        "What makes high‑achievers different",
-    ),
-    ("Blink", "Malcolm Gladwell", 2005, "Psychology", "Thinking without thinking"),
-    (
-        "The Lean Startup",
-        "Eric Ries",
-        2011,
-        "Business",
-        "How today’s entrepreneurs use continuous innovation",
-    ),
-    (
-        "Zero to One",
-        "Peter Thiel",
-        2014,
-        "Business",
-        "Notes on startups, or how to build the future",
-    ),
-    (
-        "The Intelligent Investor",
-        "Benjamin Graham",
-        1949,
-        "Finance",
-        "The definitive book on value investing",
-    ),
-    (
-        "Richest Man in Babylon",
-        "George S. Clason",
-        1926,
-        "Finance",
-        "Parables about wealth and financial wisdom",
-    ),
-    (
-        "Thinking in Systems",
-        "Donella H. Meadows",
-        2008,
-        "Science",
-        "A primer on systems thinking",
-    ),
-    (
-        "The Lean UX",
-        "Jeff Gothelf",
-        2013,
-        "Design",
-        "Applying lean principles to user experience",
-    ),
-    (
-        "Clean Architecture",
-        "Robert C. Martin",
-        2017,
-        "Programming",
-        "Crafting maintainable software architecture",
-    ),
-    (
-        "You Don’t Know JS: Up & Going",
-        "Kyle Simpson",
-        2015,
-        "Programming",
-        "Deep dive into JavaScript basics",
-    ),
-]
@@ -0,0 +1,204 @@
+import sqlite3
+import sys
+from array import array
+from collections.abc import Sequence
+from itertools import accumulate, islice
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+NULL = -(2**63)
+CHUNK = 10_000
+
+
+class _IntColumn:
+    __slots__ = ("data", "has_nulls")
+
+    def __init__(self):
+        self.data = array("q")
+        self.has_nulls = False
+
+    def extend(self, values: Tuple):
+        if NULL in values:
+            raise ValueError("value collides with the NULL sentinel")
+        if None in values:
+            self.has_nulls = True
+            values = [NULL if v is None else v for v in values]
+        self.data.extend(values)
+
+    def get(self, i: int):
+        v = self.data[i]
+        return None if v == NULL else v
+
+    def iter(self, start: int, stop: int) -> Iterator:
+        if not self.has_nulls:
+            return iter(self.data[start:stop])
+        return (None if v == NULL else v for v in self.data[start:stop])
+
+    def memory_bytes(self) -> int:
+        return sys.getsizeof(self.data)
+
+
+class _StrColumn:
+    # UTF-8 text packed into one buffer; row i is blob[offsets[i]:offsets[i + 1]].
+    __slots__ = ("blob", "offsets", "nulls")
+
+    def __init__(self):
+        self.blob = bytearray()
+        self.offsets = array("Q", [0])
+        self.nulls: Set[int] = set()
+
+    def extend(self, values: Tuple):
+        base = len(self.offsets) - 1
+        encoded = []
+        for i, v in enumerate(values):
+            if v is None:
+                self.nulls.add(base + i)
+                v = ""
+            encoded.append(v.encode())
+        self.offsets.extend(islice(accumulate(map(len, encoded), initial=self.offsets[-1]), 1, None))
+        self.blob += b"".join(encoded)
+
+    def get(self, i: int) -> Optional[str]:
+        if i in self.nulls:
+            return None
+        return self.blob[self.offsets[i] : self.offsets[i + 1]].decode()
+
+    def iter(self, start: int, stop: int) -> Iterator:
+        blob, offsets, nulls = self.blob, self.offsets, self.nulls
+        if not nulls:
+            return (blob[a:b].decode() for a, b in zip(offsets[start:stop], offsets[start + 1 : stop + 1]))
+        return (self.get(i) for i in range(start, stop))
+
+    def memory_bytes(self) -> int:
+        return sys.getsizeof(self.blob) + sys.getsizeof(self.offsets) + sys.getsizeof(self.nulls)
+
+
+class _DictColumn:
+    # Repeated values (authors, categories, statuses) are stored once and
+    # referenced by a 4-byte code per row.
+    __slots__ = ("codes", "values", "lookup")
+
+    def __init__(self):
+        self.codes = array("I")
+        self.values: List = []
+        self.lookup: Dict = {}
+
+    def extend(self, values: Tuple):
+        lookup = self.lookup
+        for v in values:
+            if v not in lookup:
+                lookup[v] = len(self.values)
+                self.values.append(v)
+        self.codes.extend(map(lookup.__getitem__, values))
+
+    def get(self, i: int):
+        return self.values[self.codes[i]]
+
+    def iter(self, start: int, stop: int) -> Iterator:
+        return map(self.values.__getitem__, self.codes[start:stop])
+
+    def memory_bytes(self) -> int:
+        return (
+            sys.getsizeof(self.codes)
+            + sys.getsizeof(self.values)
+            + sys.getsizeof(self.lookup)
+            + sum(sys.getsizeof(v) for v in self.values)
+        )
+
+
+class _ObjColumn:
+    # Fallback for a column holding values its schema code cannot pack, such
+    # as a float or "c. 1850" year; values are kept as plain Python objects.
+    __slots__ = ("data",)
+
+    def __init__(self, values: Iterable = ()):
+        self.data = list(values)
+
+    def extend(self, values: Tuple):
+        self.data.extend(values)
+
+    def get(self, i: int):
+        return self.data[i]
+
+    def iter(self, start: int, stop: int) -> Iterator:
+        return iter(self.data[start:stop])
+
+    def memory_bytes(self) -> int:
+        return sys.getsizeof(self.data) + sum(sys.getsizeof(v) for v in self.data)
+
+
+KINDS = {"i": _IntColumn, "s": _StrColumn, "d": _DictColumn}
+
+
+class Columns(Sequence):
+    # Read-only list of rows stored column by column. Rows come back as plain
+    # tuples, so callers indexing row[1] or slicing row[:5] need no changes.
+    # Schema codes: "i" int, "s" str, "d" repeated str.
+    schema = ""
+    __slots__ = ("_cols", "_len")
+
+    def __init__(self, rows: Iterable[Tuple] = ()):
+        self._cols = [KINDS[code]() for code in self.schema]
+        self._len = 0
+        rows = iter(rows)
+        while True:
+            chunk = list(islice(rows, CHUNK))
+            if not chunk:
+                break
+            self._extend(chunk)
+
+    @classmethod
+    def from_cursor(cls, cursor: sqlite3.Cursor) -> "Columns":
+        columns = cls()
+        while True:
+            chunk = cursor.fetchmany(CHUNK)
+            if not chunk:
+                return columns
+            columns._extend(chunk)
+
+    def _extend(self, rows: List[Tuple]):
+        for n, values in enumerate(zip(*rows)):
+            col = self._cols[n]
+            try:
+                col.extend(values)
+            except (TypeError, ValueError, OverflowError, AttributeError):
+                # A failed extend may have stored part of the chunk; rebuild
+                # from the rows that were complete before it.
+                self._cols[n] = _ObjColumn(col.iter(0, self._len))
+                self._cols[n].extend(values)
+        self._len += len(rows)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} rows={self._len}>"
+
+    def __iter__(self) -> Iterator[Tuple]:
+        return zip(*(col.iter(0, self._len) for col in self._cols))
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            start, stop, step = i.indices(self._len)
+            if step != 1:
+                return [self[j] for j in range(start, stop, step)]
+            return list(zip(*(col.iter(start, stop) for col in self._cols)))
+        if i < 0:
+            i += self._len
+        if not 0 <= i < self._len:
+            raise IndexError("row index out of range")
+        return tuple(col.get(i) for col in self._cols)
+
+    def memory_bytes(self) -> int:
+        return sys.getsizeof(self) + sum(col.memory_bytes() for col in self._cols)
+
+
+class BookColumns(Columns):
+    # id, title, author, year, category, description, copies, available
+    schema = "isdidsii"
+    __slots__ = ()
+
+
+class UserBookColumns(Columns):
+    # id, title, author, year, category, status, due_date, borrowed_at
+    schema = "isdiddss"
+    __slots__ = ()
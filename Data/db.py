@@ -1,16 +1,134 @@
 import os
 import sqlite3
-import hashlib
-from typing import List, Tuple, Optional
+import functools
+import json
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Tuple, Optional, Union
+
+from Data import migrations, passwords
+from Data.columns import BookColumns, UserBookColumns
 
 DB_PATH = os.path.join(os.path.dirname(__file__), "library.db")
+SEED_PATH = os.path.join(os.path.dirname(__file__), "books.csv")
+
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -20000",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA mmap_size = 268435456",
+    "PRAGMA busy_timeout = 5000",
+)
+
+_local = threading.local()
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, timeout=5.0, cached_statements=256)
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def get_conn() -> sqlite3.Connection:
+    conn = getattr(_local, "conn", None)
+    if conn is None or _local.path != DB_PATH:
+        if conn is not None:
+            conn.close()
+        conn = _connect(DB_PATH)
+        _local.conn = conn
+        _local.path = DB_PATH
+    return conn
+
+
+def close_conn():
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        conn.close()
+        _local.conn = None
+        _local.path = None
+
+
+CATALOG_CACHE_SIZE = 1024
+# Bounds memory as well as entries: each thread's connection caches its own
+# copy, and one books_all at 1M titles is ~120 MB even as BookColumns.
+CATALOG_CACHE_ROWS = 1_000_000
+
+_catalog_lock = threading.Lock()
+_catalog_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+_catalog_gen = 0
+_catalog_rows = 0
+
+
+def invalidate_catalog():
+    global _catalog_gen, _catalog_rows
+    with _catalog_lock:
+        _catalog_gen += 1
+        _catalog_cache.clear()
+        _catalog_rows = 0
+
+
+_book_listeners: List[Callable[[str, Optional[Tuple]], None]] = []
+
+
+def add_book_listener(fn: Callable[[str, Optional[Tuple]], None]):
+    _book_listeners.append(fn)
 
 
-def get_conn():
-    return sqlite3.connect(DB_PATH)
+def remove_book_listener(fn: Callable[[str, Optional[Tuple]], None]):
+    if fn in _book_listeners:
+        _book_listeners.remove(fn)
 
 
-def init_db(seed_books: Optional[List[Tuple]] = None):
+def _notify_books(event: str, row: Optional[Tuple] = None):
+    for fn in list(_book_listeners):
+        fn(event, row)
+
+
+def _cache_store(key: tuple, token: tuple, rows):
+    global _catalog_rows
+    size = len(rows)
+    if size > CATALOG_CACHE_ROWS:
+        return
+    with _catalog_lock:
+        if token[1] != _catalog_gen:
+            return
+        old = _catalog_cache.pop(key, None)
+        if old:
+            _catalog_rows -= len(old[1])
+        _catalog_cache[key] = (token, rows)
+        _catalog_rows += size
+        while len(_catalog_cache) > CATALOG_CACHE_SIZE or _catalog_rows > CATALOG_CACHE_ROWS:
+            _, (_, evicted) = _catalog_cache.popitem(last=False)
+            _catalog_rows -= len(evicted)
+
+
+def _catalog_cached(fn):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        conn = get_conn()
+        data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+        token = (data_version, _catalog_gen)
+        key = (id(conn), fn.__name__, DB_PATH, args, tuple(sorted(kwargs.items())))
+        with _catalog_lock:
+            hit = _catalog_cache.get(key)
+            if hit and hit[0] == token:
+                _catalog_cache.move_to_end(key)
+                return hit[1]
+
+        rows = fn(*args, **kwargs)
+        _cache_store(key, token, rows)
+        return rows
+
+    return wrapper
+
+
+def init_db(
+    seed_books: Optional[Union[str, Iterable[Tuple]]] = None, batch_size: int = 5000
+):
     conn = get_conn()
     cur = conn.cursor()
 
@@ -52,17 +170,6 @@ def init_db(seed_books: Optional[List[Tuple]] = None):
     """
     )
 
-    conn.commit()
-
-    cur.execute("PRAGMA table_info(borrows)")
-    cols = [r[1] for r in cur.fetchall()]
-    if "due_date" not in cols:
-        try:
-            cur.execute("ALTER TABLE borrows ADD COLUMN due_date TIMESTAMP")
-            conn.commit()
-        except Exception:
-            pass
-
     cur.execute(
         """
     CREATE TABLE IF NOT EXISTS favorites (
@@ -79,187 +186,460 @@ def init_db(seed_books: Optional[List[Tuple]] = None):
 
     conn.commit()
 
+    migrations.migrate(conn)
+
     if seed_books:
-        cur.executemany(
-            "INSERT INTO books (title, author, year, category, description) VALUES (?, ?, ?, ?, ?)",
-            seed_books,
-        )
-        conn.commit()
+        from Data import importer
 
-    conn.close()
+        importer.import_books(seed_books, batch_size)
+
+    cur.close()
 
 
 def user_create(username: str, password: str) -> int:
     conn = get_conn()
-    cur = conn.cursor()
-    password_hash = hashlib.sha256(password.encode("utf-8")).hexdigest()
+    password_hash = passwords.hash_password(password)
     try:
-        cur.execute(
-            "INSERT INTO users (username, password_hash) VALUES (?, ?)",
-            (username, password_hash),
-        )
-        conn.commit()
+        with conn:
+            cur = conn.execute(
+                "INSERT INTO users (username, password_hash) VALUES (?, ?)",
+                (username, password_hash),
+            )
         uid = cur.lastrowid
     except sqlite3.IntegrityError:
         uid = 0
-    conn.close()
     return uid
 
 
 def user_get(username: str) -> Optional[Tuple]:
     conn = get_conn()
-    cur = conn.cursor()
-    cur.execute(
+    return conn.execute(
         "SELECT id, username, password_hash FROM users WHERE username = ?", (username,)
-    )
-    row = cur.fetchone()
-    conn.close()
-    return row
+    ).fetchone()
 
 
-def user_verify(username: str, password: str) -> Optional[int]:
+def user_check(username: str, password: str) -> Optional[Tuple[int, str]]:
     row = user_get(username)
+    if not row or not passwords.verify_password(password, row[2]):
+        return None
+    return row[0], row[2]
+
+
+def user_rehash(user_id: int, old_hash: str, new_hash: str) -> bool:
+    conn = get_conn()
+    with conn:
+        cur = conn.execute(
+            "UPDATE users SET password_hash = ? WHERE id = ? AND password_hash = ?",
+            (new_hash, user_id, old_hash),
+        )
+    return cur.rowcount > 0
+
+
+def user_verify(username: str, password: str) -> Optional[int]:
+    row = user_check(username, password)
     if not row:
         return None
-    uid, uname, password_hash = row
-    if hashlib.sha256(password.encode("utf-8")).hexdigest() == password_hash:
-        return uid
-    return None
+    uid, password_hash = row
+    if passwords.needs_rehash(password_hash):
+        user_rehash(uid, password_hash, passwords.hash_password(password))
+    return uid
 
 
-def books_all() -> List[Tuple]:
+@_catalog_cached
+def books_all() -> BookColumns:
     conn = get_conn()
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT id, title, author, year, category, description FROM books ORDER BY title"
+    return BookColumns.from_cursor(
+        conn.execute(
+            "SELECT id, title, author, year, category, description, copies, available FROM books ORDER BY title COLLATE NOCASE, id"
+        )
     )
-    rows = cur.fetchall()
-    conn.close()
+
+
+@_catalog_cached
+def books_page(
+    after_title: Optional[str] = None, after_id: Optional[int] = None, limit: int = 200
+) -> List[Tuple]:
+    conn = get_conn()
+    if after_title is None:
+        return conn.execute(
+            "SELECT id, title, author, year, category, description, copies, available FROM books ORDER BY title COLLATE NOCASE, id LIMIT ?",
+            (limit,),
+        ).fetchall()
+    return conn.execute(
+        "SELECT id, title, author, year, category, description, copies, available FROM books WHERE title COLLATE NOCASE >= ? AND (title COLLATE NOCASE > ? OR id > ?) ORDER BY title COLLATE NOCASE, id LIMIT ?",
+        (after_title, after_title, after_id or 0, limit),
+    ).fetchall()
+
+
+@_catalog_cached
+def books_page_before(
+    before_title: Optional[str] = None, before_id: Optional[int] = None, limit: int = 200
+) -> List[Tuple]:
+    conn = get_conn()
+    if before_title is None:
+        rows = conn.execute(
+            "SELECT id, title, author, year, category, description, copies, available FROM books ORDER BY title COLLATE NOCASE DESC, id DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
+    else:
+        rows = conn.execute(
+            "SELECT id, title, author, year, category, description, copies, available FROM books WHERE title COLLATE NOCASE <= ? AND (title COLLATE NOCASE < ? OR id < ?) ORDER BY title COLLATE NOCASE DESC, id DESC LIMIT ?",
+            (before_title, before_title, before_id or 0, limit),
+        ).fetchall()
+    rows.reverse()
     return rows
 
 
 def add_book(
-    title: str, author: str, year: int, category: str, description: str = ""
+    title: str,
+    author: str,
+    year: int,
+    category: str,
+    description: str = "",
+    copies: int = 1,
 ) -> int:
     conn = get_conn()
-    cur = conn.cursor()
-    cur.execute(
-        "INSERT INTO books (title, author, year, category, description) VALUES (?, ?, ?, ?, ?)",
-        (title, author, year, category, description),
-    )
-    conn.commit()
-    bid = cur.lastrowid
-    conn.close()
-    return bid
+    with conn:
+        cur = conn.execute(
+            "INSERT INTO books (title, author, year, category, description, copies, available) VALUES (?1, ?2, ?3, ?4, ?5, ?6, ?6)",
+            (title, author, year, category, description, int(copies)),
+        )
+    invalidate_catalog()
+    _notify_books("add", (cur.lastrowid, title, author, category))
+    return cur.lastrowid
 
 
-def books_search(query: str) -> List[Tuple]:
-    like = f"%{query}%"
+def book_set_copies(book_id: int, copies: int) -> bool:
     conn = get_conn()
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT id, title, author, year, category, description FROM books WHERE title LIKE ? OR author LIKE ? OR category LIKE ? ORDER BY title",
-        (like, like, like),
-    )
-    rows = cur.fetchall()
-    conn.close()
-    return rows
+    with conn:
+        cur = conn.execute(
+            "UPDATE books SET available = available + ?1 - copies, copies = ?1 WHERE id = ?2 AND ?1 >= copies - available",
+            (int(copies), book_id),
+        )
+    invalidate_catalog()
+    return cur.rowcount > 0
 
 
-def borrow_book(user_id: int, book_id: int, days: int = 14) -> int:
+def inventory_rebuild():
     conn = get_conn()
-    cur = conn.cursor()
-    modifier = f"+{int(days)} days"
-    cur.execute(
-        "INSERT INTO borrows (user_id, book_id, due_date) VALUES (?, ?, datetime('now', ?))",
-        (user_id, book_id, modifier),
-    )
-    conn.commit()
-    bid = cur.lastrowid
-    conn.close()
-    return bid
+    with conn:
+        migrations.recount_available(conn)
+    invalidate_catalog()
 
 
-def return_book(user_id: int, book_id: int) -> bool:
+def _fts_query(query: str) -> str:
+    terms = re.findall(r"\w+", query)
+    return " ".join(f'"{t}"*' for t in terms)
+
+
+@_catalog_cached
+def books_search(query: str, limit: Optional[int] = None) -> BookColumns:
+    match = _fts_query(query)
+    if not match:
+        return BookColumns()
     conn = get_conn()
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT id FROM borrows WHERE user_id = ? AND book_id = ? AND returned_at IS NULL ORDER BY borrowed_at DESC",
-        (user_id, book_id),
+    return BookColumns.from_cursor(
+        conn.execute(
+            "SELECT b.id, b.title, b.author, b.year, b.category, b.description, b.copies, b.available FROM books_fts f JOIN books b ON b.id = f.rowid WHERE books_fts MATCH ? ORDER BY bm25(books_fts, 10.0, 5.0, 2.0, 1.0), b.title LIMIT ?",
+            (match, -1 if limit is None else limit),
+        )
     )
-    row = cur.fetchone()
-    if not row:
-        conn.close()
-        return False
-    borrow_id = row[0]
-    cur.execute(
-        "UPDATE borrows SET returned_at = CURRENT_TIMESTAMP WHERE id = ?", (borrow_id,)
+
+
+FUZZY_TRIGRAMS = 4
+FUZZY_CANDIDATES = 200
+FUZZY_ALTERNATIVES = 3
+FUZZY_MIN_WORD = 0.3
+
+
+def _trigrams(word: str) -> set:
+    padded = f"  {word} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _word_similarity(a: str, b: str) -> float:
+    ta, tb = _trigrams(a), _trigrams(b)
+    return len(ta & tb) / len(ta | tb)
+
+
+def _similar_words(conn: sqlite3.Connection, term: str) -> List[Tuple[float, str]]:
+    grams = sorted({term[i : i + 3] for i in range(len(term) - 2)})
+    if not grams:
+        return []
+    # The rarest trigrams pick out the intended word even when the typo
+    # leaves only common ones intact; an unordered LIMIT keeps the scan bounded.
+    freq = dict(
+        conn.execute(
+            f"SELECT term, doc FROM books_trigram_vocab WHERE term IN ({','.join('?' * len(grams))})",
+            grams,
+        ).fetchall()
     )
-    conn.commit()
-    conn.close()
-    return True
+    picked = sorted(freq, key=freq.get)[:FUZZY_TRIGRAMS]
+    if not picked:
+        return []
+    words = set()
+    for title, author in conn.execute(
+        "SELECT title, author FROM books_trigram WHERE books_trigram MATCH ? LIMIT ?",
+        (" OR ".join(f'"{g}"' for g in picked), FUZZY_CANDIDATES),
+    ):
+        words.update(re.findall(r"\w+", f"{title} {author or ''}".casefold()))
+    if term not in words and conn.execute(
+        "SELECT 1 FROM books_fts WHERE books_fts MATCH ? LIMIT 1",
+        (f'{{title author}}: "{term}"',),
+    ).fetchone():
+        words.add(term)
+    scored = sorted(((_word_similarity(term, w), w) for w in words), reverse=True)
+    return [(sim, w) for sim, w in scored[:FUZZY_ALTERNATIVES] if sim >= FUZZY_MIN_WORD]
+
+
+@_catalog_cached
+def did_you_mean(query: str, limit: int = 3) -> List[str]:
+    terms = re.findall(r"\w+", query.casefold())
+    if not terms:
+        return []
+    conn = get_conn()
+    options = [_similar_words(conn, t.replace('"', "")) or [(0.0, t)] for t in terms]
+
+    best = [o[0] for o in options]
+    candidates = {tuple(w for _, w in best): sum(sim for sim, _ in best)}
+    for i, alternatives in enumerate(options):
+        for sim, word in alternatives[1:]:
+            words = [w for _, w in best]
+            words[i] = word
+            score = sum(s for s, _ in best) - best[i][0] + sim
+            candidates.setdefault(tuple(words), score)
+
+    typed = tuple(terms)
+    ranked = sorted(candidates.items(), key=lambda c: -c[1])
+    return [" ".join(words) for words, _ in ranked if words != typed][:limit]
+
+
+def books_fuzzy(query: str, limit: int = 50) -> BookColumns:
+    for suggestion in did_you_mean(query):
+        rows = books_search(suggestion, limit)
+        if rows:
+            return rows
+    return BookColumns()
+
+
+BORROW_SQL = "INSERT INTO borrows (user_id, book_id, due_date) SELECT ?, j.value, datetime('now', ?) FROM json_each(?) j RETURNING id"
+RETURN_SQL = "UPDATE borrows SET returned_at = CURRENT_TIMESTAMP WHERE id IN (SELECT (SELECT br.id FROM borrows br WHERE br.user_id = ? AND br.book_id = j.value AND br.returned_at IS NULL ORDER BY br.borrowed_at DESC, br.id DESC LIMIT 1) FROM json_each(?) j) RETURNING book_id"
+FAVORITE_ADD_SQL = "INSERT OR IGNORE INTO favorites (user_id, book_id) VALUES (?, ?)"
+FAVORITE_REMOVE_SQL = "DELETE FROM favorites WHERE user_id = ? AND book_id = ?"
+
+
+def borrow_books(user_id: int, book_ids: List[int], days: int = 14) -> List[int]:
+    ids = [int(b) for b in book_ids]
+    if not ids:
+        return []
+    conn = get_conn()
+    modifier = f"+{int(days)} days"
+    try:
+        with conn:
+            rows = conn.execute(
+                BORROW_SQL, (user_id, modifier, json.dumps(ids))
+            ).fetchall()
+    except sqlite3.IntegrityError:
+        return []
+    invalidate_catalog()
+    return [r[0] for r in rows]
+
+
+def borrow_book(user_id: int, book_id: int, days: int = 14) -> int:
+    ids = borrow_books(user_id, [book_id], days)
+    return ids[0] if ids else 0
+
+
+def return_books(user_id: int, book_ids: List[int]) -> List[int]:
+    ids = [int(b) for b in book_ids]
+    if not ids:
+        return []
+    conn = get_conn()
+    with conn:
+        rows = conn.execute(RETURN_SQL, (user_id, json.dumps(ids))).fetchall()
+    if rows:
+        invalidate_catalog()
+    return [r[0] for r in rows]
+
+
+def return_book(user_id: int, book_id: int) -> bool:
+    return bool(return_books(user_id, [book_id]))
 
 
 def borrowed_by_user(user_id: int) -> List[Tuple]:
     conn = get_conn()
-    cur = conn.cursor()
-    cur.execute(
+    return conn.execute(
         "SELECT b.id, b.title, b.author, b.year, b.category, br.borrowed_at, br.due_date, br.returned_at FROM borrows br JOIN books b ON br.book_id = b.id WHERE br.user_id = ? ORDER BY br.borrowed_at DESC",
         (user_id,),
+    ).fetchall()
+
+
+def user_books(user_id: int) -> UserBookColumns:
+    conn = get_conn()
+    return UserBookColumns.from_cursor(
+        conn.execute(
+            "SELECT b.id, b.title, b.author, b.year, b.category, CASE WHEN m.open_loans THEN 'Borrowed' WHEN m.loans THEN 'Returned' ELSE '' END || CASE WHEN NOT m.favorite THEN '' WHEN m.loans THEN ', favorite' ELSE 'Favorite' END, m.due_date, m.borrowed_at FROM (SELECT book_id, SUM(open_loan) AS open_loans, SUM(loan) AS loans, MAX(favorite) AS favorite, MIN(due_date) AS due_date, MAX(borrowed_at) AS borrowed_at FROM (SELECT book_id, returned_at IS NULL AS open_loan, 1 AS loan, 0 AS favorite, CASE WHEN returned_at IS NULL THEN due_date END AS due_date, borrowed_at FROM borrows WHERE user_id = ?1 UNION ALL SELECT book_id, 0, 0, 1, NULL, NULL FROM favorites WHERE user_id = ?1) GROUP BY book_id) m JOIN books b ON b.id = m.book_id ORDER BY m.open_loans > 0 DESC, m.favorite DESC, b.title COLLATE NOCASE, b.id",
+            (user_id,),
+        )
     )
-    rows = cur.fetchall()
-    conn.close()
-    return rows
+
+
+OVERDUE_BUCKETS = (
+    ("1-7 days", 1, 7),
+    ("8-30 days", 8, 30),
+    ("31-90 days", 31, 90),
+    ("90+ days", 91, None),
+)
+
+
+def _overdue_bounds(now: Optional[datetime]) -> Tuple[str, Dict[str, Tuple]]:
+    now = now or datetime.utcnow()
+
+    def stamp(days):
+        return (now - timedelta(days=days)).strftime("%Y-%m-%d %H:%M:%S")
+
+    bounds = {}
+    for label, low, high in OVERDUE_BUCKETS:
+        bounds[label] = (stamp(high) if high else None, stamp(low - 1))
+    return stamp(0), bounds
+
+
+def overdue_report(now: Optional[datetime] = None) -> List[Tuple[str, int]]:
+    _, bounds = _overdue_bounds(now)
+    labels = [label for label, _, _ in OVERDUE_BUCKETS]
+    cases = " ".join(
+        f"WHEN due_date < ? THEN {i}" for i in range(len(labels) - 1, 0, -1)
+    )
+    params = [bounds[labels[i]][1] for i in range(len(labels) - 1, 0, -1)]
+    conn = get_conn()
+    rows = conn.execute(
+        f"SELECT CASE {cases} ELSE 0 END AS bucket, COUNT(*) FROM borrows WHERE returned_at IS NULL AND due_date < ? GROUP BY bucket",
+        params + [bounds[labels[0]][1]],
+    ).fetchall()
+    counts = dict(rows)
+    return [(label, counts.get(i, 0)) for i, label in enumerate(labels)]
+
+
+def overdue_loans(
+    now: Optional[datetime] = None,
+    bucket: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> List[Tuple]:
+    _, bounds = _overdue_bounds(now)
+    if bucket:
+        low, high = bounds[bucket]
+    else:
+        low, high = None, bounds[OVERDUE_BUCKETS[0][0]][1]
+    # Only add the lower bound when there is one: an "?3 IS NULL OR" guard
+    # keeps SQLite from using it as a range bound on idx_borrows_overdue.
+    lower = "AND br.due_date >= ?4 " if low is not None else ""
+    conn = get_conn()
+    return conn.execute(
+        f"SELECT br.id, br.user_id, u.username, b.id, b.title, br.borrowed_at, br.due_date, CAST(julianday(?1) - julianday(br.due_date) + 0.99999 AS INTEGER) AS days_late FROM borrows br JOIN books b ON b.id = br.book_id LEFT JOIN users u ON u.id = br.user_id WHERE br.returned_at IS NULL AND br.due_date < ?2 {lower}ORDER BY br.due_date LIMIT ?3",
+        (
+            (now or datetime.utcnow()).strftime("%Y-%m-%d %H:%M:%S"),
+            high,
+            -1 if limit is None else limit,
+        )
+        + ((low,) if low is not None else ()),
+    ).fetchall()
+
+
+def dashboard_stats(top: int = 10) -> Dict:
+    conn = get_conn()
+    stats = {name: 0 for name in migrations.STATS_COUNTERS}
+    stats.update(conn.execute("SELECT name, value FROM stats_counters").fetchall())
+    stats["overdue"] = sum(n for _, n in overdue_report())
+    stats["categories"] = conn.execute(
+        "SELECT category, loans FROM stats_category_loans WHERE loans > 0 ORDER BY loans DESC, category LIMIT ?",
+        (top,),
+    ).fetchall()
+    stats["top_titles"] = conn.execute(
+        "SELECT b.id, b.title, b.author, s.loans FROM stats_book_loans s JOIN books b ON b.id = s.book_id ORDER BY s.loans DESC, s.book_id LIMIT ?",
+        (top,),
+    ).fetchall()
+    return stats
+
+
+def _stats_snapshot(conn: sqlite3.Connection) -> Dict[str, dict]:
+    return {
+        "counters": dict(conn.execute("SELECT name, value FROM stats_counters")),
+        "categories": dict(
+            conn.execute("SELECT category, loans FROM stats_category_loans WHERE loans <> 0")
+        ),
+        "books": dict(
+            conn.execute("SELECT book_id, loans FROM stats_book_loans WHERE loans <> 0")
+        ),
+    }
+
+
+def stats_rebuild():
+    conn = get_conn()
+    with conn:
+        migrations.rebuild_stats(conn)
+
+
+def stats_verify() -> List[Tuple[str, object, object, object]]:
+    conn = get_conn()
+    # Read-only: one snapshot for both sides, no write lock taken.
+    conn.execute("BEGIN")
+    try:
+        stored = _stats_snapshot(conn)
+        fresh = {
+            "counters": dict(conn.execute(migrations.STATS_COUNTERS_SQL)),
+            "categories": dict(conn.execute(migrations.STATS_CATEGORY_SQL)),
+            "books": dict(conn.execute(migrations.STATS_BOOK_SQL)),
+        }
+    finally:
+        conn.rollback()
+
+    mismatches = []
+    for section in stored:
+        for key in sorted(set(stored[section]) | set(fresh[section]), key=str):
+            have = stored[section].get(key, 0)
+            want = fresh[section].get(key, 0)
+            if have != want:
+                mismatches.append((section, key, have, want))
+    return mismatches
 
 
 def favorites_add(user_id: int, book_id: int) -> bool:
     conn = get_conn()
-    cur = conn.cursor()
     try:
-        cur.execute(
-            "INSERT OR IGNORE INTO favorites (user_id, book_id) VALUES (?, ?)",
-            (user_id, book_id),
-        )
-        conn.commit()
+        with conn:
+            cur = conn.execute(FAVORITE_ADD_SQL, (user_id, book_id))
         ok = cur.rowcount > 0
     except Exception:
         ok = False
-    conn.close()
     return ok
 
 
 def favorites_remove(user_id: int, book_id: int) -> bool:
     conn = get_conn()
-    cur = conn.cursor()
-    cur.execute(
-        "DELETE FROM favorites WHERE user_id = ? AND book_id = ?", (user_id, book_id)
-    )
-    changed = cur.rowcount
-    conn.commit()
-    conn.close()
-    return changed > 0
+    with conn:
+        cur = conn.execute(FAVORITE_REMOVE_SQL, (user_id, book_id))
+    return cur.rowcount > 0
 
 
 def favorites_by_user(user_id: int) -> List[Tuple]:
     conn = get_conn()
-    cur = conn.cursor()
-    cur.execute(
+    return conn.execute(
         "SELECT b.id, b.title, b.author, b.year, b.category, f.added_at FROM favorites f JOIN books b ON f.book_id = b.id WHERE f.user_id = ? ORDER BY f.added_at DESC",
         (user_id,),
-    )
-    rows = cur.fetchall()
-    conn.close()
-    return rows
+    ).fetchall()
 
 
 def book_delete(book_id: int) -> bool:
     conn = get_conn()
-    cur = conn.cursor()
-    cur.execute("DELETE FROM books WHERE id = ?", (book_id,))
-    changed = cur.rowcount
-    conn.commit()
-    conn.close()
-    return changed > 0
+    with conn:
+        row = conn.execute(
+            "DELETE FROM books WHERE id = ? RETURNING id, title, author, category",
+            (book_id,),
+        ).fetchone()
+    invalidate_catalog()
+    if row:
+        _notify_books("delete", row)
+    return row is not None
 
 
 def db_exists() -> bool:
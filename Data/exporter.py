@@ -0,0 +1,107 @@
+import csv
+import gzip
+import io
+import json
+import pathlib
+import sqlite3
+from typing import Callable, Iterator, Optional, Tuple
+
+from Data import db
+
+EXPORTS = {
+    "books": (
+        (
+            "id",
+            "title",
+            "author",
+            "year",
+            "category",
+            "description",
+            "copies",
+            "available",
+        ),
+        "SELECT id, title, author, year, category, description, copies, available FROM books ORDER BY id",
+    ),
+    "borrows": (
+        (
+            "id",
+            "user_id",
+            "username",
+            "book_id",
+            "title",
+            "borrowed_at",
+            "due_date",
+            "returned_at",
+        ),
+        "SELECT br.id, br.user_id, u.username, br.book_id, b.title, br.borrowed_at, br.due_date, br.returned_at FROM borrows br LEFT JOIN users u ON u.id = br.user_id LEFT JOIN books b ON b.id = br.book_id ORDER BY br.id",
+    ),
+    "favorites": (
+        ("id", "user_id", "username", "book_id", "title", "added_at"),
+        "SELECT f.id, f.user_id, u.username, f.book_id, b.title, f.added_at FROM favorites f LEFT JOIN users u ON u.id = f.user_id LEFT JOIN books b ON b.id = f.book_id ORDER BY f.id",
+    ),
+}
+
+
+def _read_conn(check_same_thread: bool = True) -> sqlite3.Connection:
+    uri = pathlib.Path(db.DB_PATH).resolve().as_uri() + "?mode=ro"
+    return sqlite3.connect(uri, uri=True, check_same_thread=check_same_thread)
+
+
+def _open_text(path: str) -> io.TextIOBase:
+    if path.endswith(".gz"):
+        return gzip.open(path, "wt", encoding="utf-8", newline="")
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def export_format(path: str) -> str:
+    name = path[:-3] if path.endswith(".gz") else path
+    if name.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    if name.endswith(".csv"):
+        return "csv"
+    raise ValueError(f"Unsupported export format: {path}")
+
+
+def iter_rows(kind: str, batch_size: int = 1000) -> Iterator[Tuple]:
+    _, sql = EXPORTS[kind]
+    conn = _read_conn()
+    try:
+        cur = conn.execute(sql)
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                break
+            yield from rows
+    finally:
+        conn.close()
+
+
+def export(
+    kind: str,
+    path: str,
+    fmt: Optional[str] = None,
+    batch_size: int = 1000,
+    progress: Optional[Callable[[int], None]] = None,
+) -> int:
+    columns, _ = EXPORTS[kind]
+    fmt = fmt or export_format(path)
+    count = 0
+    with _open_text(path) as f:
+        if fmt == "csv":
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            write = writer.writerow
+        else:
+
+            def write(row):
+                f.write(json.dumps(dict(zip(columns, row)), ensure_ascii=False))
+                f.write("\n")
+
+        for row in iter_rows(kind, batch_size):
+            write(row)
+            count += 1
+            if progress and count % batch_size == 0:
+                progress(count)
+    if progress:
+        progress(count)
+    return count
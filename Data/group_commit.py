@@ -0,0 +1,171 @@
+import json
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Optional, Tuple
+
+from Data import db
+
+DURABILITY = {
+    "full": "PRAGMA synchronous = FULL",
+    "normal": "PRAGMA synchronous = NORMAL",
+    "off": "PRAGMA synchronous = OFF",
+}
+
+_STOP = object()
+
+
+def _fail(future: Future, error: BaseException):
+    if not future.done():
+        future.set_exception(error)
+
+
+def _borrow(conn: sqlite3.Connection, user_id: int, book_id: int, days: int) -> int:
+    try:
+        row = conn.execute(
+            db.BORROW_SQL, (user_id, f"+{int(days)} days", json.dumps([int(book_id)]))
+        ).fetchone()
+    except sqlite3.IntegrityError:
+        return 0
+    return row[0] if row else 0
+
+
+def _return(conn: sqlite3.Connection, user_id: int, book_id: int) -> bool:
+    rows = conn.execute(db.RETURN_SQL, (user_id, json.dumps([int(book_id)]))).fetchall()
+    return bool(rows)
+
+
+def _favorite_add(conn: sqlite3.Connection, user_id: int, book_id: int) -> bool:
+    try:
+        return conn.execute(db.FAVORITE_ADD_SQL, (user_id, book_id)).rowcount > 0
+    except sqlite3.IntegrityError:
+        return False
+
+
+def _favorite_remove(conn: sqlite3.Connection, user_id: int, book_id: int) -> bool:
+    return conn.execute(db.FAVORITE_REMOVE_SQL, (user_id, book_id)).rowcount > 0
+
+
+class GroupCommitWriter:
+    def __init__(
+        self,
+        max_batch: int = 256,
+        max_delay_ms: float = 2.0,
+        durability: str = "normal",
+        path: Optional[str] = None,
+    ):
+        if durability not in DURABILITY:
+            raise ValueError(f"durability must be one of {sorted(DURABILITY)}")
+        self.max_batch = max_batch
+        self.max_delay = max_delay_ms / 1000.0
+        self.durability = durability
+        self.path = path or db.DB_PATH
+        self.batches = 0
+        self.operations = 0
+        self._queue: "queue.Queue" = queue.Queue()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="group-commit", daemon=True)
+        self._thread.start()
+
+    def _submit(self, op, *args) -> Future:
+        future: Future = Future()
+        with self._lock:
+            if self._closed or not self._thread.is_alive():
+                raise RuntimeError("writer is closed")
+            self._queue.put((op, args, future))
+        return future
+
+    def borrow_book(self, user_id: int, book_id: int, days: int = 14) -> Future:
+        return self._submit(_borrow, user_id, book_id, days)
+
+    def return_book(self, user_id: int, book_id: int) -> Future:
+        return self._submit(_return, user_id, book_id)
+
+    def favorites_add(self, user_id: int, book_id: int) -> Future:
+        return self._submit(_favorite_add, user_id, book_id)
+
+    def favorites_remove(self, user_id: int, book_id: int) -> Future:
+        return self._submit(_favorite_remove, user_id, book_id)
+
+    def close(self):
+        with self._lock:
+            closing = not self._closed
+            self._closed = True
+        if closing:
+            self._queue.put(_STOP)
+        self._thread.join()
+
+    def _collect(self, first) -> Tuple[List, bool]:
+        batch, stop = [first], False
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                stop = True
+                break
+            batch.append(item)
+        return batch, stop
+
+    def _run(self):
+        conn = None
+        stop = False
+        try:
+            conn = db._connect(self.path)
+            conn.isolation_level = None
+            conn.execute(DURABILITY[self.durability])
+            while not stop:
+                first = self._queue.get()
+                if first is _STOP:
+                    break
+                batch, stop = self._collect(first)
+                self._flush(conn, batch)
+        finally:
+            with self._lock:
+                self._closed = True
+            error = RuntimeError("writer stopped")
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not _STOP:
+                    _fail(item[2], error)
+            if conn is not None:
+                conn.close()
+
+    def _flush(self, conn: sqlite3.Connection, batch: List):
+        results = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for op, args, _ in batch:
+                try:
+                    results.append((op(conn, *args), None))
+                except Exception as e:
+                    results.append((None, e))
+            conn.execute("COMMIT")
+        except Exception as e:
+            try:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+            except sqlite3.Error:
+                pass
+            for _, _, future in batch:
+                _fail(future, e)
+            return
+
+        self.batches += 1
+        self.operations += len(batch)
+        if any(op in (_borrow, _return) and value for (op, _, _), (value, _) in zip(batch, results)):
+            db.invalidate_catalog()
+        for (_, _, future), (value, error) in zip(batch, results):
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(value)
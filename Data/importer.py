@@ -0,0 +1,134 @@
+import csv
+import gzip
+import io
+import json
+import sqlite3
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, Union
+
+from Data import db
+
+INSERT_SQL = "INSERT INTO books (title, author, year, category, description, copies, available) VALUES (?1, ?2, ?3, ?4, ?5, ?6, ?6)"
+
+
+def _open_text(path: str) -> io.TextIOBase:
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", newline="")
+    return open(path, "r", encoding="utf-8", newline="")
+
+
+def _int(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _record(data: dict) -> Optional[Tuple]:
+    data = {str(k).strip().lower(): v for k, v in data.items() if k is not None}
+    title = (data.get("title") or "").strip()
+    if not title:
+        return None
+    return (
+        title,
+        data.get("author") or "",
+        _int(data.get("year")),
+        data.get("category") or "",
+        data.get("description") or "",
+        max(_int(data.get("copies")) or 1, 1),
+    )
+
+
+def iter_csv(path: str) -> Iterator[Tuple]:
+    with _open_text(path) as f:
+        for data in csv.DictReader(f):
+            rec = _record(data)
+            if rec:
+                yield rec
+
+
+def iter_jsonl(path: str) -> Iterator[Tuple]:
+    with _open_text(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            rec = _record(json.loads(line))
+            if rec:
+                yield rec
+
+
+def iter_records(path: str) -> Iterator[Tuple]:
+    name = path[:-3] if path.endswith(".gz") else path
+    if name.endswith((".jsonl", ".ndjson")):
+        return iter_jsonl(path)
+    if name.endswith(".csv"):
+        return iter_csv(path)
+    raise ValueError(f"Unsupported catalog format: {path}")
+
+
+def _suspend_maintenance(conn: sqlite3.Connection) -> List[Tuple[str, str, str]]:
+    saved = conn.execute(
+        "SELECT type, name, sql FROM sqlite_master WHERE tbl_name = 'books' AND sql IS NOT NULL AND (type = 'index' OR (type = 'trigger' AND (name LIKE 'books\\_fts\\_%' ESCAPE '\\' OR name LIKE 'books\\_trigram\\_%' ESCAPE '\\')))"
+    ).fetchall()
+    with conn:
+        for kind, name, _ in saved:
+            conn.execute(f'DROP {kind.upper()} IF EXISTS "{name}"')
+    return saved
+
+
+def _resume_maintenance(
+    conn: sqlite3.Connection, saved: List[Tuple[str, str, str]], first_id: int
+):
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        existing = {
+            r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE tbl_name = 'books'")
+        }
+        # migrations.repair in another process may already have restored the
+        # triggers and re-indexed the catalog while this import ran.
+        if not any(name in existing for _, name, _ in saved):
+            conn.execute(
+                "INSERT INTO books_fts (rowid, title, author, category, description) SELECT id, title, author, category, description FROM books WHERE id > ?",
+                (first_id,),
+            )
+            conn.execute(
+                "INSERT INTO books_trigram (rowid, title, author) SELECT id, title, author FROM books WHERE id > ?",
+                (first_id,),
+            )
+        for _, name, sql in saved:
+            if name not in existing:
+                conn.execute(sql)
+
+
+def import_books(
+    source: Union[str, Iterable[Tuple]],
+    batch_size: int = 5000,
+    progress: Optional[Callable[[int], None]] = None,
+    defer_indexes: bool = True,
+) -> int:
+    records = iter_records(source) if isinstance(source, str) else iter(source)
+    conn = db.get_conn()
+    first_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM books").fetchone()[0]
+    saved = _suspend_maintenance(conn) if defer_indexes else []
+
+    count = 0
+    try:
+        while True:
+            batch = [
+                r if len(r) == 6 else tuple(r) + (1,)
+                for r in islice(records, batch_size)
+            ]
+            if not batch:
+                break
+            with conn:
+                conn.executemany(INSERT_SQL, batch)
+            count += len(batch)
+            if progress:
+                progress(count)
+    finally:
+        if defer_indexes:
+            _resume_maintenance(conn, saved, first_id)
+        db.invalidate_catalog()
+        db._notify_books("reset")
+    return count
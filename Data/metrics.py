@@ -0,0 +1,241 @@
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from Data import db
+from Data.columns import Columns
+
+log = logging.getLogger("library.db")
+
+BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+SLOW_LOG_SIZE = 100
+SKIP = ("get_conn", "close_conn", "db_exists", "add_book_listener", "remove_book_listener")
+
+_lock = threading.Lock()
+_local = threading.local()
+_originals: Dict[str, object] = {}
+_functions: Dict[str, "Histogram"] = {}
+_slow: "deque[dict]" = deque(maxlen=SLOW_LOG_SIZE)
+_counters = {"connections_opened": 0, "rows_fetched": 0, "statements": 0}
+_since: Optional[str] = None
+
+slow_ms: Optional[float] = None
+trace_sql = False
+
+
+class Histogram:
+    __slots__ = ("count", "errors", "rows", "total", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.rows = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+
+    def add(self, ms: float, rows: int, error: bool):
+        self.count += 1
+        self.errors += error
+        self.rows += rows
+        self.total += ms
+        self.max = max(self.max, ms)
+        for i, bound in enumerate(BUCKETS_MS):
+            if ms <= bound:
+                self.buckets[i] += 1
+                return
+        self.buckets[-1] += 1
+
+    def percentile(self, pct: float) -> float:
+        rank = pct / 100.0 * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= rank:
+                return min(BUCKETS_MS[i], self.max) if i < len(BUCKETS_MS) else self.max
+        return 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "rows": self.rows,
+            "mean_ms": round(self.total / self.count, 4) if self.count else 0.0,
+            "max_ms": round(self.max, 4),
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "buckets": dict(zip([str(b) for b in BUCKETS_MS] + ["inf"], self.buckets)),
+        }
+
+
+def enabled() -> bool:
+    return bool(_originals)
+
+
+def _trace(sql: str):
+    if sql.startswith("--"):
+        return
+    # Python 3.11+ reports the parent statement again for each trigger
+    # subprogram instead of a "-- TRIGGER" comment; count it once.
+    if _local.statements and _local.statements[-1] == sql:
+        return
+    _local.statements.append(sql)
+    if trace_sql:
+        log.debug("%s", sql)
+
+
+def _connect(path: str):
+    conn = _originals["_connect"](path)
+    with _lock:
+        _counters["connections_opened"] += 1
+    if getattr(_local, "statements", None) is not None:
+        conn.set_trace_callback(_trace)
+    return conn
+
+
+def _thread_conn():
+    # The calling thread's open connection, without opening one: a call that
+    # runs no SQL must not leave a stray connection behind.
+    conn = getattr(db._local, "conn", None)
+    if conn is None or db._local.path != db.DB_PATH:
+        return None
+    return conn
+
+
+def _explain(sql: str) -> List[str]:
+    head = sql.split(None, 1)[0].upper() if sql.strip() else ""
+    if head not in ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE"):
+        return []
+    try:
+        return [r[3] for r in db.get_conn().execute("EXPLAIN QUERY PLAN " + sql)]
+    except Exception as e:
+        return [f"unavailable: {e}"]
+
+
+def _record_slow(name: str, ms: float, statements: List[str]):
+    entry = {
+        "at": datetime.now().isoformat(timespec="seconds"),
+        "function": name,
+        "ms": round(ms, 3),
+        "statements": [{"sql": sql, "plan": _explain(sql)} for sql in statements],
+    }
+    with _lock:
+        _slow.append(entry)
+    log.warning("slow %s: %.1f ms", name, ms)
+    for stmt in entry["statements"]:
+        log.warning("  %s", stmt["sql"])
+        for line in stmt["plan"]:
+            log.warning("    %s", line)
+
+
+def _instrument(name: str, fn):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        outer = getattr(_local, "statements", None)
+        statements: List[str] = []
+        _local.statements = statements
+        if outer is None:
+            conn = _thread_conn()
+            if conn is not None:
+                conn.set_trace_callback(_trace)
+        error = True
+        start = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+            error = False
+            return result
+        finally:
+            ms = (time.perf_counter() - start) * 1000.0
+            _local.statements = outer
+            if outer is not None:
+                outer.extend(statements)
+            else:
+                conn = _thread_conn()
+                if conn is not None:
+                    conn.set_trace_callback(None)
+            rows = len(result) if not error and isinstance(result, (list, Columns)) else 0
+            with _lock:
+                _functions.setdefault(name, Histogram()).add(ms, rows, error)
+                _counters["rows_fetched"] += rows
+                _counters["statements"] += len(statements) if outer is None else 0
+            if outer is None and slow_ms is not None and ms >= slow_ms:
+                _record_slow(name, ms, statements)
+
+    return wrapper
+
+
+def _public_functions() -> List[str]:
+    return [
+        name
+        for name, value in vars(db).items()
+        if callable(value)
+        and not name.startswith("_")
+        and name not in SKIP
+        and getattr(value, "__module__", None) == db.__name__
+    ]
+
+
+def enable(slow_query_ms: Optional[float] = None, trace: bool = False):
+    global slow_ms, trace_sql, _since
+    slow_ms, trace_sql = slow_query_ms, trace
+    if enabled():
+        return
+    _since = datetime.now().isoformat(timespec="seconds")
+    _originals["_connect"] = db._connect
+    db._connect = _connect
+    for name in _public_functions():
+        _originals[name] = getattr(db, name)
+        setattr(db, name, _instrument(name, _originals[name]))
+
+
+def disable():
+    for name, fn in _originals.items():
+        setattr(db, name, fn)
+    _originals.clear()
+
+
+def reset():
+    global _since
+    with _lock:
+        _functions.clear()
+        _slow.clear()
+        for key in _counters:
+            _counters[key] = 0
+        _since = datetime.now().isoformat(timespec="seconds") if enabled() else None
+
+
+def configure_from_env():
+    if os.environ.get("LIBRARY_METRICS"):
+        slow = os.environ.get("LIBRARY_SLOW_MS")
+        enable(float(slow) if slow else None, bool(os.environ.get("LIBRARY_TRACE_SQL")))
+
+
+def snapshot() -> dict:
+    with _lock:
+        return {
+            "enabled": enabled(),
+            "since": _since,
+            "taken_at": datetime.now().isoformat(timespec="seconds"),
+            "slow_query_ms": slow_ms,
+            "counters": dict(_counters),
+            "functions": {
+                name: hist.as_dict()
+                for name, hist in sorted(_functions.items())
+                if hist.count
+            },
+            "slow_queries": list(_slow),
+        }
+
+
+def write_snapshot(path: str) -> dict:
+    data = snapshot()
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    return data
@@ -0,0 +1,338 @@
+import sqlite3
+from typing import Callable, List, Tuple
+
+
+def _borrows_due_date(conn: sqlite3.Connection):
+    cols = [r[1] for r in conn.execute("PRAGMA table_info(borrows)")]
+    if "due_date" not in cols:
+        conn.execute("ALTER TABLE borrows ADD COLUMN due_date TIMESTAMP")
+
+
+def _books_fts(conn: sqlite3.Connection):
+    conn.execute(
+        """
+    CREATE VIRTUAL TABLE IF NOT EXISTS books_fts USING fts5(
+        title, author, category, description,
+        content='books', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """
+    )
+    conn.execute(
+        """
+    CREATE TRIGGER IF NOT EXISTS books_fts_ai AFTER INSERT ON books BEGIN
+        INSERT INTO books_fts (rowid, title, author, category, description)
+        VALUES (new.id, new.title, new.author, new.category, new.description);
+    END
+    """
+    )
+    conn.execute(
+        """
+    CREATE TRIGGER IF NOT EXISTS books_fts_ad AFTER DELETE ON books BEGIN
+        INSERT INTO books_fts (books_fts, rowid, title, author, category, description)
+        VALUES ('delete', old.id, old.title, old.author, old.category, old.description);
+    END
+    """
+    )
+    conn.execute(
+        """
+    CREATE TRIGGER IF NOT EXISTS books_fts_au AFTER UPDATE ON books BEGIN
+        INSERT INTO books_fts (books_fts, rowid, title, author, category, description)
+        VALUES ('delete', old.id, old.title, old.author, old.category, old.description);
+        INSERT INTO books_fts (rowid, title, author, category, description)
+        VALUES (new.id, new.title, new.author, new.category, new.description);
+    END
+    """
+    )
+    indexed = conn.execute("SELECT 1 FROM books_fts_docsize LIMIT 1").fetchone()
+    if not indexed and conn.execute("SELECT 1 FROM books LIMIT 1").fetchone():
+        conn.execute("INSERT INTO books_fts (books_fts) VALUES ('rebuild')")
+
+
+def _borrows_indexes(conn: sqlite3.Connection):
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_borrows_open_user_book ON borrows (user_id, book_id, borrowed_at) WHERE returned_at IS NULL"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_borrows_user_borrowed ON borrows (user_id, borrowed_at)"
+    )
+
+
+def _favorites_indexes(conn: sqlite3.Connection):
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_favorites_user_added ON favorites (user_id, added_at)"
+    )
+
+
+def _books_title_index(conn: sqlite3.Connection):
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_books_title ON books (title COLLATE NOCASE, id)"
+    )
+
+
+def recount_available(conn: sqlite3.Connection):
+    conn.execute("UPDATE books SET available = copies")
+    conn.execute(
+        """
+    UPDATE books SET copies = MAX(books.copies, o.n), available = MAX(books.copies, o.n) - o.n
+    FROM (SELECT book_id, COUNT(*) AS n FROM borrows WHERE returned_at IS NULL GROUP BY book_id) AS o
+    WHERE o.book_id = books.id
+    """
+    )
+
+
+def _books_fts_update_trigger(conn: sqlite3.Connection):
+    # Availability updates must not re-index the row in books_fts.
+    conn.execute("DROP TRIGGER IF EXISTS books_fts_au")
+    conn.execute(
+        """
+    CREATE TRIGGER books_fts_au AFTER UPDATE OF title, author, category, description ON books BEGIN
+        INSERT INTO books_fts (books_fts, rowid, title, author, category, description)
+        VALUES ('delete', old.id, old.title, old.author, old.category, old.description);
+        INSERT INTO books_fts (rowid, title, author, category, description)
+        VALUES (new.id, new.title, new.author, new.category, new.description);
+    END
+    """
+    )
+
+
+def _books_copies(conn: sqlite3.Connection):
+    cols = [r[1] for r in conn.execute("PRAGMA table_info(books)")]
+    if "copies" not in cols:
+        conn.execute("ALTER TABLE books ADD COLUMN copies INTEGER NOT NULL DEFAULT 1")
+    if "available" not in cols:
+        conn.execute("ALTER TABLE books ADD COLUMN available INTEGER NOT NULL DEFAULT 1")
+
+    _books_fts_update_trigger(conn)
+
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_borrows_open_book ON borrows (book_id) WHERE returned_at IS NULL"
+    )
+    recount_available(conn)
+
+    conn.execute(
+        """
+    CREATE TRIGGER IF NOT EXISTS borrows_copies_check BEFORE INSERT ON borrows
+    WHEN new.returned_at IS NULL BEGIN
+        SELECT RAISE(ABORT, 'no copies available')
+        WHERE (SELECT available FROM books WHERE id = new.book_id) <= 0;
+    END
+    """
+    )
+    conn.execute(
+        """
+    CREATE TRIGGER IF NOT EXISTS borrows_copies_out AFTER INSERT ON borrows
+    WHEN new.returned_at IS NULL BEGIN
+        UPDATE books SET available = available - 1 WHERE id = new.book_id;
+    END
+    """
+    )
+    conn.execute(
+        """
+    CREATE TRIGGER IF NOT EXISTS borrows_copies_in AFTER UPDATE OF returned_at ON borrows
+    WHEN old.returned_at IS NULL AND new.returned_at IS NOT NULL BEGIN
+        UPDATE books SET available = available + 1 WHERE id = new.book_id;
+    END
+    """
+    )
+    conn.execute(
+        """
+    CREATE TRIGGER IF NOT EXISTS borrows_copies_delete AFTER DELETE ON borrows
+    WHEN old.returned_at IS NULL BEGIN
+        UPDATE books SET available = available + 1 WHERE id = old.book_id;
+    END
+    """
+    )
+
+
+def _borrows_overdue_index(conn: sqlite3.Connection):
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_borrows_overdue ON borrows (due_date) WHERE returned_at IS NULL"
+    )
+
+
+STATS_COUNTERS = ("titles", "loans_open", "loans_total", "favorites")
+
+
+STATS_COUNTERS_SQL = "SELECT 'titles', COUNT(*) FROM books UNION ALL SELECT 'loans_open', COUNT(*) FROM borrows WHERE returned_at IS NULL UNION ALL SELECT 'loans_total', COUNT(*) FROM borrows UNION ALL SELECT 'favorites', COUNT(*) FROM favorites"
+STATS_CATEGORY_SQL = "SELECT COALESCE(b.category, ''), COUNT(*) FROM borrows br JOIN books b ON b.id = br.book_id GROUP BY COALESCE(b.category, '')"
+STATS_BOOK_SQL = "SELECT br.book_id, COUNT(*) FROM borrows br JOIN books b ON b.id = br.book_id GROUP BY br.book_id"
+
+
+def rebuild_stats(conn: sqlite3.Connection):
+    conn.execute("DELETE FROM stats_counters")
+    conn.execute("DELETE FROM stats_category_loans")
+    conn.execute("DELETE FROM stats_book_loans")
+    conn.execute(f"INSERT INTO stats_counters (name, value) {STATS_COUNTERS_SQL}")
+    conn.execute(f"INSERT INTO stats_category_loans (category, loans) {STATS_CATEGORY_SQL}")
+    conn.execute(f"INSERT INTO stats_book_loans (book_id, loans) {STATS_BOOK_SQL}")
+
+
+def _stats_tables(conn: sqlite3.Connection):
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS stats_counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL) WITHOUT ROWID"
+    )
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS stats_category_loans (category TEXT PRIMARY KEY, loans INTEGER NOT NULL) WITHOUT ROWID"
+    )
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS stats_book_loans (book_id INTEGER PRIMARY KEY, loans INTEGER NOT NULL)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_stats_book_loans ON stats_book_loans (loans DESC, book_id)"
+    )
+    rebuild_stats(conn)
+
+    triggers = {
+        "stats_books_ai": """AFTER INSERT ON books BEGIN
+        UPDATE stats_counters SET value = value + 1 WHERE name = 'titles';
+    END""",
+        "stats_books_ad": """AFTER DELETE ON books BEGIN
+        UPDATE stats_counters SET value = value - 1 WHERE name = 'titles';
+        UPDATE stats_category_loans
+            SET loans = loans - (SELECT loans FROM stats_book_loans WHERE book_id = old.id)
+            WHERE category = COALESCE(old.category, '')
+            AND EXISTS (SELECT 1 FROM stats_book_loans WHERE book_id = old.id);
+        DELETE FROM stats_book_loans WHERE book_id = old.id;
+    END""",
+        "stats_borrows_ai": """AFTER INSERT ON borrows BEGIN
+        UPDATE stats_counters SET value = value + 1 WHERE name = 'loans_total';
+        UPDATE stats_counters SET value = value + 1
+            WHERE name = 'loans_open' AND new.returned_at IS NULL;
+        INSERT INTO stats_category_loans (category, loans)
+            SELECT COALESCE(category, ''), 1 FROM books WHERE id = new.book_id
+            ON CONFLICT (category) DO UPDATE SET loans = loans + 1;
+        INSERT INTO stats_book_loans (book_id, loans)
+            SELECT id, 1 FROM books WHERE id = new.book_id
+            ON CONFLICT (book_id) DO UPDATE SET loans = loans + 1;
+    END""",
+        "stats_borrows_au": """AFTER UPDATE OF returned_at ON borrows
+    WHEN (old.returned_at IS NULL) <> (new.returned_at IS NULL) BEGIN
+        UPDATE stats_counters
+            SET value = value + (CASE WHEN new.returned_at IS NULL THEN 1 ELSE -1 END)
+            WHERE name = 'loans_open';
+    END""",
+        "stats_borrows_ad": """AFTER DELETE ON borrows BEGIN
+        UPDATE stats_counters SET value = value - 1 WHERE name = 'loans_total';
+        UPDATE stats_counters SET value = value - 1
+            WHERE name = 'loans_open' AND old.returned_at IS NULL;
+        UPDATE stats_category_loans SET loans = loans - 1
+            WHERE category = (SELECT COALESCE(category, '') FROM books WHERE id = old.book_id);
+        UPDATE stats_book_loans SET loans = loans - 1 WHERE book_id = old.book_id;
+    END""",
+        "stats_favorites_ai": """AFTER INSERT ON favorites BEGIN
+        UPDATE stats_counters SET value = value + 1 WHERE name = 'favorites';
+    END""",
+        "stats_favorites_ad": """AFTER DELETE ON favorites BEGIN
+        UPDATE stats_counters SET value = value - 1 WHERE name = 'favorites';
+    END""",
+    }
+    for name, body in triggers.items():
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+
+
+def _books_trigram(conn: sqlite3.Connection):
+    conn.execute(
+        """
+    CREATE VIRTUAL TABLE IF NOT EXISTS books_trigram USING fts5(
+        title, author,
+        content='books', content_rowid='id',
+        tokenize='trigram', detail='column'
+    )
+    """
+    )
+    conn.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS books_trigram_vocab USING fts5vocab(books_trigram, 'row')"
+    )
+    conn.execute(
+        """
+    CREATE TRIGGER IF NOT EXISTS books_trigram_ai AFTER INSERT ON books BEGIN
+        INSERT INTO books_trigram (rowid, title, author) VALUES (new.id, new.title, new.author);
+    END
+    """
+    )
+    conn.execute(
+        """
+    CREATE TRIGGER IF NOT EXISTS books_trigram_ad AFTER DELETE ON books BEGIN
+        INSERT INTO books_trigram (books_trigram, rowid, title, author)
+        VALUES ('delete', old.id, old.title, old.author);
+    END
+    """
+    )
+    conn.execute(
+        """
+    CREATE TRIGGER IF NOT EXISTS books_trigram_au AFTER UPDATE OF title, author ON books BEGIN
+        INSERT INTO books_trigram (books_trigram, rowid, title, author)
+        VALUES ('delete', old.id, old.title, old.author);
+        INSERT INTO books_trigram (rowid, title, author) VALUES (new.id, new.title, new.author);
+    END
+    """
+    )
+    if conn.execute("SELECT 1 FROM books LIMIT 1").fetchone():
+        conn.execute("INSERT INTO books_trigram (books_trigram) VALUES ('rebuild')")
+
+
+MIGRATIONS: List[Tuple[int, Callable[[sqlite3.Connection], None]]] = [
+    (1, _borrows_due_date),
+    (2, _books_fts),
+    (3, _borrows_indexes),
+    (4, _favorites_indexes),
+    (5, _books_title_index),
+    (6, _books_copies),
+    (7, _borrows_overdue_index),
+    (8, _stats_tables),
+    (9, _books_trigram),
+]
+
+
+# Dropped by a bulk import while it runs (see importer._suspend_maintenance).
+BOOKS_MAINTENANCE = (
+    "books_fts_ai",
+    "books_fts_ad",
+    "books_fts_au",
+    "books_trigram_ai",
+    "books_trigram_ad",
+    "books_trigram_au",
+    "idx_books_title",
+)
+
+
+def _missing_maintenance(conn: sqlite3.Connection) -> List[str]:
+    names = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE tbl_name = 'books'")}
+    return [name for name in BOOKS_MAINTENANCE if name not in names]
+
+
+def repair(conn: sqlite3.Connection) -> List[str]:
+    # An import that was killed before it finished leaves the search indexes
+    # without triggers; restore them and re-index everything.
+    if not _missing_maintenance(conn):
+        return []
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        missing = _missing_maintenance(conn)
+        if any(name.startswith("books_fts_") for name in missing):
+            _books_fts(conn)
+            _books_fts_update_trigger(conn)
+            conn.execute("INSERT INTO books_fts (books_fts) VALUES ('rebuild')")
+        if any(name.startswith("books_trigram_") for name in missing):
+            _books_trigram(conn)
+        _books_title_index(conn)
+    return missing
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    for version, step in MIGRATIONS:
+        if version <= schema_version(conn):
+            continue
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            if version <= schema_version(conn):
+                continue
+            step(conn)
+            conn.execute(f"PRAGMA user_version = {version}")
+    repair(conn)
+    return schema_version(conn)
@@ -1 +1,9 @@
-__all__ = ["dashboard", "library", "profile", "settings"]
+__all__ = [
+    "background",
+    "dashboard",
+    "library",
+    "paged_table",
+    "profile",
+    "settings",
+    "table_binding",
+]
@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from Data import db
+from Pages.background import BackgroundRunner
+from Data.auth import get_service
 
 
 class AuthPage(tk.Frame):
@@ -35,15 +36,28 @@ class AuthPage(tk.Frame):
         btn_frame = tk.Frame(self)
         btn_frame.pack(pady=12)
 
-        ttk.Button(btn_frame, text="Sign in", command=self.try_signin).grid(
-            row=0, column=0, padx=6
+        self.signin_button = ttk.Button(
+            btn_frame, text="Sign in", command=self.try_signin
         )
-        ttk.Button(btn_frame, text="Register", command=self.try_register).grid(
-            row=0, column=1, padx=6
+        self.signin_button.grid(row=0, column=0, padx=6)
+        self.register_button = ttk.Button(
+            btn_frame, text="Register", command=self.try_register
         )
+        self.register_button.grid(row=0, column=1, padx=6)
+
+        self.status = tk.StringVar()
+        tk.Label(self, textvariable=self.status, fg="#555555").pack()
+
+        self.worker = BackgroundRunner(self)
 
         self.pack(fill="both", expand=True)
 
+    def _set_busy(self, message):
+        state = ["disabled"] if message else ["!disabled"]
+        self.signin_button.state(state)
+        self.register_button.state(state)
+        self.status.set(message)
+
     def try_signin(self):
         uname = self.username.get().strip()
         pwd = self.password.get()
@@ -51,7 +65,19 @@ class AuthPage(tk.Frame):
             messagebox.showwarning("Missing", "Please enter username and password.")
             return
 
-        uid = db.user_verify(uname, pwd)
+        self._set_busy("Signing in...")
+        self.worker.watch(
+            get_service().verify(uname, pwd),
+            lambda future: self._signin_done(uname, future),
+        )
+
+    def _signin_done(self, uname, future):
+        self._set_busy("")
+        try:
+            uid = future.result()
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not sign in: {e}")
+            return
         if uid:
             messagebox.showinfo("Welcome", f"Signed in as {uname}.")
             self.on_success(uid, uname)
@@ -67,7 +93,19 @@ class AuthPage(tk.Frame):
             )
             return
 
-        uid = db.user_create(uname, pwd)
+        self._set_busy("Creating account...")
+        self.worker.watch(
+            get_service().create(uname, pwd),
+            lambda future: self._register_done(uname, future),
+        )
+
+    def _register_done(self, uname, future):
+        self._set_busy("")
+        try:
+            uid = future.result()
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not register: {e}")
+            return
         if uid:
             messagebox.showinfo("Registered", "Account created — now signed in.")
             self.on_success(uid, uname)
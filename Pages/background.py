@@ -0,0 +1,54 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
+
+
+class BackgroundRunner:
+    def __init__(self, widget, max_workers: int = 1, poll_ms: int = 15):
+        self.widget = widget
+        self.poll_ms = poll_ms
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._waiting: List[Tuple[Future, Optional[Callable]]] = []
+        self._polling = False
+        widget.bind("<Destroy>", self._on_destroy, add="+")
+
+    def submit(self, fn, *args, callback: Optional[Callable] = None) -> Future:
+        return self.watch(self.executor.submit(fn, *args), callback)
+
+    def watch(self, future: Future, callback: Optional[Callable] = None) -> Future:
+        self._waiting.append((future, callback))
+        if not self._polling:
+            self._polling = True
+            self.widget.after(self.poll_ms, self._poll)
+        return future
+
+    def shutdown(self):
+        for future, _ in self._waiting:
+            future.cancel()
+        self._waiting = []
+        self.executor.shutdown(wait=False)
+
+    def _on_destroy(self, event):
+        # Toplevel bindings also see their children being destroyed.
+        if event.widget is self.widget:
+            self.shutdown()
+
+    def _poll(self):
+        if not self.widget.winfo_exists():
+            self.shutdown()
+            self._polling = False
+            return
+
+        # One pass: a future finishing between two checks would otherwise be
+        # dropped from both lists and its callback never run.
+        done, pending = [], []
+        for item in self._waiting:
+            (done if item[0].done() else pending).append(item)
+        self._waiting = pending
+        for future, callback in done:
+            if callback and not future.cancelled():
+                callback(future)
+
+        if self._waiting:
+            self.widget.after(self.poll_ms, self._poll)
+        else:
+            self._polling = False
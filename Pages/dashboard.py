@@ -1,4 +1,7 @@
 import tkinter as tk
+from tkinter import ttk, messagebox
+from Data import db
+from Pages.background import BackgroundRunner
 
 
 class DashboardPage(tk.Frame):
@@ -6,6 +9,7 @@ class DashboardPage(tk.Frame):
         super().__init__(parent)
 
         self.pack_propagate(False)
+        self.worker = BackgroundRunner(self)
 
         center_frame = tk.Frame(self)
         center_frame.pack(expand=True, fill="both")
@@ -18,4 +22,92 @@ class DashboardPage(tk.Frame):
 
         tk.Label(
             center_frame, text=welcome_text, font=("Arial", 30, "bold"), fg="#333333"
-        ).pack(pady=40)
+        ).pack(pady=(40, 20))
+
+        numbers = tk.Frame(center_frame)
+        numbers.pack(pady=10)
+        self.counters = {}
+        for col, (key, label) in enumerate(
+            (
+                ("titles", "Titles"),
+                ("loans_open", "Books out"),
+                ("overdue", "Overdue"),
+                ("favorites", "Favorites"),
+            )
+        ):
+            var = tk.StringVar(value="-")
+            tk.Label(numbers, textvariable=var, font=("Arial", 24, "bold")).grid(
+                row=0, column=col, padx=30
+            )
+            tk.Label(numbers, text=label, fg="#555555").grid(row=1, column=col)
+            self.counters[key] = var
+
+        tables = tk.Frame(center_frame)
+        tables.pack(fill="both", expand=True, padx=20, pady=10)
+
+        self.categories = ttk.Treeview(
+            tables, columns=("category", "loans"), show="headings", height=8
+        )
+        self.categories.heading("category", text="Category")
+        self.categories.heading("loans", text="Loans")
+        self.categories.column("loans", width=80, anchor="e")
+        self.categories.pack(side="left", fill="both", expand=True, padx=(0, 10))
+
+        self.top_titles = ttk.Treeview(
+            tables, columns=("title", "author", "loans"), show="headings", height=8
+        )
+        self.top_titles.heading("title", text="Top borrowed")
+        self.top_titles.heading("author", text="Author")
+        self.top_titles.heading("loans", text="Loans")
+        self.top_titles.column("title", width=260)
+        self.top_titles.column("loans", width=80, anchor="e")
+        self.top_titles.pack(side="left", fill="both", expand=True)
+
+        self.rebuild_button = ttk.Button(
+            center_frame, text="Rebuild statistics", command=self.rebuild
+        )
+        self.rebuild_button.pack(pady=(0, 10))
+
+        self.bind("<Map>", lambda event: self.refresh())
+
+    def on_show(self):
+        self.refresh()
+
+    def refresh(self):
+        stats = db.dashboard_stats()
+        for key, var in self.counters.items():
+            var.set(f"{stats.get(key, 0):,}")
+
+        self.categories.delete(*self.categories.get_children())
+        for category, loans in stats["categories"]:
+            self.categories.insert("", "end", values=(category or "-", f"{loans:,}"))
+
+        self.top_titles.delete(*self.top_titles.get_children())
+        for _, title, author, loans in stats["top_titles"]:
+            self.top_titles.insert("", "end", values=(title, author, f"{loans:,}"))
+
+    def rebuild(self):
+        self.rebuild_button.state(["disabled"])
+        self.worker.submit(self._verify_and_rebuild, callback=self._rebuilt)
+
+    @staticmethod
+    def _verify_and_rebuild():
+        mismatches = db.stats_verify()
+        db.stats_rebuild()
+        return mismatches
+
+    def _rebuilt(self, future):
+        self.rebuild_button.state(["!disabled"])
+        try:
+            mismatches = future.result()
+        except Exception as e:
+            messagebox.showerror("Rebuild failed", str(e))
+            return
+        self.refresh()
+        if mismatches:
+            messagebox.showinfo(
+                "Statistics rebuilt",
+                f"Corrected {len(mismatches)} drifted value(s).",
+            )
+        else:
+            messagebox.showinfo("Statistics rebuilt", "Statistics were already consistent.")
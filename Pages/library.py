@@ -1,28 +1,78 @@
-from tkinter import ttk, messagebox, simpledialog
-from Data import db
+from tkinter import ttk, messagebox, simpledialog, filedialog
+from Pages.background import BackgroundRunner
+from Pages.paged_table import PagedTable
+from Pages.table_binding import TableBinding
+from Data import autocomplete, db, importer
 import tkinter as tk
 
+SEARCH_DELAY_MS = 200
+SEARCH_LIMIT = 500
+OVERDUE_LIMIT = 1000
+
+
+def _fuzzy_search(query):
+    suggestions = db.did_you_mean(query)
+    return suggestions, db.books_fuzzy(query, SEARCH_LIMIT) if suggestions else []
+
 
 class LibraryPage(tk.Frame):
     def __init__(self, parent, current_user=None):
         super().__init__(parent)
 
         self.current_user = current_user
+        self.worker = BackgroundRunner(self)
+        self._search_job = None
+        self._search_gen = 0
+        self._search_future = None
+        self.import_worker = BackgroundRunner(self)
+        self._import_count = 0
+        self.complete_worker = BackgroundRunner(self)
+        self.completer = None
 
         search_frame = tk.Frame(self)
         search_frame.pack(fill="x", padx=10, pady=6)
 
         tk.Label(search_frame, text="Search").pack(side="left")
         self.search_var = tk.StringVar()
-        entry = tk.Entry(search_frame, textvariable=self.search_var, width=40)
+        self.entry = entry = tk.Entry(search_frame, textvariable=self.search_var, width=40)
         ttk.Button(search_frame, text="Add books", command=self.add_books).pack(
             side="right"
         )
+        self.import_button = ttk.Button(
+            search_frame, text="Import catalog", command=self.import_catalog
+        )
+        self.import_button.pack(side="right", padx=6)
+        ttk.Button(
+            search_frame, text="Overdue loans", command=self.open_overdue_window
+        ).pack(side="right", padx=6)
+        self.status_var = tk.StringVar()
+        tk.Label(search_frame, textvariable=self.status_var, fg="#555555").pack(
+            side="right", padx=6
+        )
         entry.pack(side="left", padx=10)
         entry.bind("<KeyRelease>", self.search_books)
-
-        columns = ("id", "title", "author", "year", "category")
-        self.table = ttk.Treeview(self, columns=columns, show="headings")
+        entry.bind("<FocusIn>", self._load_completer)
+        entry.bind("<FocusOut>", lambda e: self.after(100, self._hide_on_blur))
+        entry.bind("<Down>", self._focus_completions)
+        entry.bind("<Escape>", lambda e: self._hide_completions())
+
+        self.completions = tk.Listbox(self, height=autocomplete.TOP_K, activestyle="none")
+        self.completions.bind("<Return>", self._accept_completion)
+        self.completions.bind("<ButtonRelease-1>", self._accept_completion)
+        self.completions.bind("<Escape>", lambda e: self.entry.focus_set())
+        self.completions.bind("<FocusOut>", lambda e: self.after(100, self._hide_on_blur))
+        self._completion_labels = []
+
+        self.suggest_frame = tk.Frame(self)
+        self.suggest_frame.pack(fill="x", padx=10)
+
+        table_frame = tk.Frame(self)
+        table_frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+        columns = ("id", "title", "author", "year", "category", "available")
+        self.table = ttk.Treeview(
+            table_frame, columns=columns, show="headings", selectmode="extended"
+        )
         for col in columns:
             if col == "id":
                 self.table.heading(col, text="")
@@ -32,8 +82,19 @@ class LibraryPage(tk.Frame):
                 self.table.column(col, anchor="w", width=170)
 
         self.table.column("year", width=70)
-
-        self.table.pack(fill="both", expand=True, padx=10, pady=10)
+        self.table.column("available", width=80)
+
+        scrollbar = ttk.Scrollbar(table_frame, orient="vertical")
+        scrollbar.pack(side="right", fill="y")
+        self.table.pack(side="left", fill="both", expand=True)
+
+        self.pager = PagedTable(
+            self.table,
+            scrollbar,
+            self._page_after,
+            self._page_before,
+            values=lambda row: row[:5] + (f"{row[7]}/{row[6]}",),
+        )
 
         btn_frame = tk.Frame(self)
         btn_frame.pack(pady=10)
@@ -51,24 +112,157 @@ class LibraryPage(tk.Frame):
             row=0, column=3, padx=10
         )
 
-        self.refresh_books()
-
         self.profile_page_ref = None
+        self._loaded = False
+        self.bind("<Map>", self._first_load)
+
+    def _first_load(self, event=None):
+        if not self._loaded:
+            self._loaded = True
+            self.after_idle(self.refresh_books)
 
     def set_profile_ref(self, profile_frame):
         self.profile_page_ref = profile_frame
 
+    def _load_completer(self, event=None):
+        if self.completer is None:
+            self.completer = False
+            self.complete_worker.submit(
+                autocomplete.get_index, callback=self._completer_loaded
+            )
+
+    def _completer_loaded(self, future):
+        try:
+            self.completer = future.result()
+        except Exception:
+            self.completer = None
+
+    def _update_completions(self):
+        query = self.search_var.get()
+        matches = self.completer.complete(query) if self.completer and query.strip() else []
+        self._completion_labels = [label for _, label, _ in matches]
+        if not matches:
+            self._hide_completions()
+            return
+        self.completions.delete(0, "end")
+        for kind, label, _ in matches:
+            self.completions.insert("end", f"{label}    ({kind})")
+        self.completions.configure(height=len(matches))
+        self.completions.place(in_=self.entry, x=0, rely=1.0, relwidth=1.5)
+        self.completions.lift()
+
+    def _hide_completions(self):
+        self.completions.place_forget()
+
+    def _hide_on_blur(self):
+        if self.focus_get() not in (self.entry, self.completions):
+            self._hide_completions()
+
+    def _focus_completions(self, event=None):
+        if self.completions.winfo_ismapped():
+            self.completions.focus_set()
+            self.completions.selection_clear(0, "end")
+            self.completions.selection_set(0)
+            self.completions.activate(0)
+        return "break"
+
+    def _accept_completion(self, event=None):
+        selected = self.completions.curselection()
+        if not selected:
+            return
+        self.search_var.set(self._completion_labels[selected[0]])
+        self._hide_completions()
+        self.entry.focus_set()
+        self.entry.icursor("end")
+        if self._search_job:
+            self.after_cancel(self._search_job)
+        self._run_search()
+
     def search_books(self, event=None):
+        if event is not None and event.keysym in ("Down", "Up", "Escape"):
+            return
+        self._update_completions()
+        if self._search_job:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(SEARCH_DELAY_MS, self._run_search)
+
+    def _run_search(self):
+        self._search_job = None
         query = self.search_var.get().lower()
 
-        for row in self.table.get_children():
-            self.table.delete(row)
+        self._search_gen += 1
+        gen = self._search_gen
+        if self._search_future:
+            self._search_future.cancel()
+            self._search_future = None
+
+        self._show_suggestions([])
+        if not query:
+            self.pager.reset()
+            return
+
+        self._search_future = self.worker.submit(
+            db.books_search,
+            query,
+            SEARCH_LIMIT,
+            callback=lambda future: self._show_results(gen, query, future),
+        )
+
+    def _show_results(self, gen, query, future):
+        if gen != self._search_gen:
+            return
+        self._search_future = None
+        try:
+            rows = future.result()
+        except Exception:
+            rows = []
+        if rows:
+            self.pager.show(rows, query)
+            return
 
-        rows = db.books_search(query) if query else db.books_all()
-        for row in rows:
-            self.table.insert(
-                "", "end", values=(row[0], row[1], row[2], row[3], row[4])
+        self._search_future = self.worker.submit(
+            _fuzzy_search,
+            query,
+            callback=lambda future: self._show_fuzzy(gen, query, future),
+        )
+
+    def _show_fuzzy(self, gen, query, future):
+        if gen != self._search_gen:
+            return
+        self._search_future = None
+        try:
+            suggestions, rows = future.result()
+        except Exception:
+            suggestions, rows = [], []
+        self._show_suggestions(suggestions)
+        self.pager.show(rows, query)
+
+    def _show_suggestions(self, suggestions):
+        for child in self.suggest_frame.winfo_children():
+            child.destroy()
+        if not suggestions:
+            return
+        tk.Label(self.suggest_frame, text="Did you mean:", fg="#555555").pack(side="left")
+        for suggestion in suggestions:
+            link = tk.Label(
+                self.suggest_frame, text=suggestion, fg="#1a5fb4", cursor="hand2"
             )
+            link.pack(side="left", padx=4)
+            link.bind("<Button-1>", lambda e, s=suggestion: self._use_suggestion(s))
+
+    def _use_suggestion(self, suggestion):
+        self.search_var.set(suggestion)
+        if self._search_job:
+            self.after_cancel(self._search_job)
+        self._run_search()
+
+    def _page_after(self, row, limit):
+        if row is None:
+            return db.books_page(limit=limit)
+        return db.books_page(row[1], row[0], limit)
+
+    def _page_before(self, row, limit):
+        return db.books_page_before(row[1], row[0], limit)
 
     def add_books(self):
         title = simpledialog.askstring("Add Book", "Enter book title:", parent=self)
@@ -99,6 +293,104 @@ class LibraryPage(tk.Frame):
         messagebox.showinfo("Book Added", f"'{title}' by {author} added to library.")
         self.refresh_books()
 
+    def import_catalog(self):
+        path = filedialog.askopenfilename(
+            parent=self,
+            title="Import catalog",
+            filetypes=[
+                ("Catalog files", "*.csv *.jsonl *.ndjson *.gz"),
+                ("All files", "*.*"),
+            ],
+        )
+        if not path:
+            return
+
+        self._import_count = 0
+        self.import_button.state(["disabled"])
+        self.status_var.set("Importing...")
+        self.import_worker.submit(
+            lambda: importer.import_books(path, progress=self._import_progress),
+            callback=self._import_done,
+        )
+        self.after(250, self._show_import_progress)
+
+    def _import_progress(self, count):
+        self._import_count = count
+
+    def _show_import_progress(self):
+        if self.import_button.instate(["disabled"]):
+            self.status_var.set(f"Imported {self._import_count:,} books...")
+            self.after(250, self._show_import_progress)
+
+    def _import_done(self, future):
+        self.import_button.state(["!disabled"])
+        self.status_var.set("")
+        try:
+            count = future.result()
+        except Exception as e:
+            messagebox.showerror("Import failed", str(e))
+            self.refresh_books()
+            return
+        messagebox.showinfo("Import finished", f"Imported {count:,} books.")
+        self.refresh_books()
+
+    def open_overdue_window(self):
+        top = tk.Toplevel(self)
+        top.title("Overdue Loans")
+        top.geometry("900x450")
+
+        summary = tk.StringVar()
+        tk.Label(top, textvariable=summary, anchor="w").pack(fill="x", padx=8, pady=4)
+
+        filter_frame = tk.Frame(top)
+        filter_frame.pack(fill="x", padx=8)
+        tk.Label(filter_frame, text="Days late").pack(side="left")
+        buckets = ["All"] + [label for label, _, _ in db.OVERDUE_BUCKETS]
+        bucket_var = tk.StringVar(value="All")
+        combo = ttk.Combobox(
+            filter_frame,
+            textvariable=bucket_var,
+            values=buckets,
+            state="readonly",
+            width=14,
+        )
+        combo.pack(side="left", padx=8)
+
+        cols = ("id", "username", "title", "borrowed_at", "due_date", "days_late")
+        tree = ttk.Treeview(top, columns=cols, show="headings")
+        for c in cols:
+            if c == "id":
+                tree.heading(c, text="")
+                tree.column(c, width=0, stretch=False)
+            else:
+                tree.heading(c, text=c.replace("_", " ").title())
+                tree.column(c, width=140)
+        tree.column("title", width=260)
+        tree.column("days_late", width=80)
+        tree.pack(fill="both", expand=True, padx=8, pady=8)
+        binding = TableBinding(
+            tree, values=lambda r: (r[0], r[2], r[4], r[5], r[6], r[7])
+        )
+
+        def load(event=None):
+            report = db.overdue_report()
+            total = sum(n for _, n in report)
+            summary.set(
+                f"{total:,} overdue: "
+                + ", ".join(f"{label}: {n:,}" for label, n in report)
+            )
+            bucket = bucket_var.get()
+            binding.apply(
+                db.overdue_loans(
+                    bucket=None if bucket == "All" else bucket,
+                    limit=OVERDUE_LIMIT,
+                )
+            )
+
+        combo.bind("<<ComboboxSelected>>", load)
+        load()
+        top.transient(self)
+
     def details(self):
         selected = self.table.focus()
         if not selected:
@@ -113,7 +405,7 @@ class LibraryPage(tk.Frame):
         )
 
     def borrow(self):
-        selected = self.table.focus()
+        selected = self.table.selection()
         if not selected:
             messagebox.showwarning("Warning", "Select a book first.")
             return
@@ -121,12 +413,13 @@ class LibraryPage(tk.Frame):
         if not self.current_user:
             messagebox.showwarning("Not signed in", "Please sign in to borrow books.")
             return
-        values = self.table.item(selected, "values")
-        book_id = values[0]
+        titles = [self.table.item(iid, "values")[1] for iid in selected]
 
         days = simpledialog.askinteger(
             "Borrow days",
-            "How many days would you like to borrow this book for?",
+            "How many days would you like to borrow "
+            + ("this book" if len(selected) == 1 else f"these {len(selected)} books")
+            + " for?",
             parent=self,
             minvalue=1,
             initialvalue=14,
@@ -134,8 +427,22 @@ class LibraryPage(tk.Frame):
         if days is None:
             return
 
-        db.borrow_book(self.current_user[0], book_id, days)
-        messagebox.showinfo("Borrowed", f"You borrowed '{values[1]}' for {days} days.")
+        if not db.borrow_books(self.current_user[0], list(selected), days):
+            messagebox.showwarning(
+                "Not available",
+                "No copies are left of "
+                + (f"'{titles[0]}'." if len(titles) == 1 else "one of the selected books.")
+                + " Nothing was borrowed.",
+            )
+            self.refresh_books()
+            return
+        self.refresh_books()
+        if len(titles) == 1:
+            messagebox.showinfo("Borrowed", f"You borrowed '{titles[0]}' for {days} days.")
+        else:
+            messagebox.showinfo(
+                "Borrowed", f"You borrowed {len(titles)} books for {days} days."
+            )
         try:
             if self.profile_page_ref:
                 self.profile_page_ref.refresh_books()
@@ -193,16 +500,13 @@ class LibraryPage(tk.Frame):
 
         ok = db.book_delete(book_id)
         if ok:
-            self.table.delete(selected)
+            self.pager.remove(selected)
             messagebox.showinfo("Deleted", f"'{title}' was removed from library.")
         else:
             messagebox.showwarning("Not found", "Could not delete the selected book.")
 
     def refresh_books(self):
-        for row in self.table.get_children():
-            self.table.delete(row)
-        rows = db.books_all()
-        for row in rows:
-            self.table.insert(
-                "", "end", values=(row[0], row[1], row[2], row[3], row[4])
-            )
+        if self.search_var.get():
+            self._run_search()
+        else:
+            self.pager.refresh()
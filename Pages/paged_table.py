@@ -0,0 +1,128 @@
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from Pages.table_binding import TableBinding
+
+Fetch = Callable[[Optional[Tuple], int], List[Tuple]]
+
+
+class PagedTable:
+    def __init__(
+        self,
+        table,
+        scrollbar,
+        fetch_after: Fetch,
+        fetch_before: Fetch,
+        page_size: int = 100,
+        max_pages: int = 3,
+        values: Callable[[Tuple], Sequence] = lambda row: row[:5],
+    ):
+        self.table = table
+        self.scrollbar = scrollbar
+        self.fetch_after = fetch_after
+        self.fetch_before = fetch_before
+        self.page_size = page_size
+        self.max_rows = page_size * max_pages
+        self.binding = TableBinding(table, values)
+
+        self.rows: List[Tuple] = []
+        self.paged = True
+        self.at_start = True
+        self.at_end = True
+        self.shown_key = None
+        self._pending = False
+
+        self.table.configure(yscrollcommand=self._on_scroll)
+        self.scrollbar.configure(command=self.table.yview)
+
+    def reset(self):
+        self.paged = True
+        rows = self.fetch_after(None, self.page_size)
+        self._replace(rows)
+        self.at_start = True
+        self.at_end = len(rows) < self.page_size
+        self.table.yview_moveto(0)
+
+    def refresh(self):
+        if not self.paged or not self.rows:
+            self.reset()
+            return
+        anchor = self.fetch_before(self.rows[0], 1)
+        limit = max(len(self.rows), self.page_size)
+        rows = self.fetch_after(anchor[0] if anchor else None, limit)
+        self._replace(rows)
+        self.at_start = not anchor
+        self.at_end = len(rows) < limit
+
+    def show(self, rows: List[Tuple], key=None):
+        # Showing the same results again (a refresh after a borrow or return)
+        # keeps the scroll position; new results start at the top.
+        same = not self.paged and key is not None and key == self.shown_key
+        top = self.table.yview()[0] if same else 0
+        self.paged = False
+        self.shown_key = key
+        self._replace(rows)
+        self.at_start = self.at_end = True
+        self.table.yview_moveto(top)
+
+    def remove(self, iid: str):
+        self.rows = [r for r in self.rows if str(r[0]) != iid]
+        self.binding.remove(iid)
+
+    def _replace(self, rows: List[Tuple]):
+        self.rows = list(rows)
+        self.binding.apply(self.rows)
+
+    def _on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        if not self.paged or self._pending:
+            return
+        if (float(last) >= 0.9 and not self.at_end) or (
+            float(first) <= 0.1 and not self.at_start
+        ):
+            self._pending = True
+            self.table.after_idle(self._fill)
+
+    def _fill(self):
+        self._pending = False
+        if not self.paged or not self.rows:
+            return
+        first, last = self.table.yview()
+        if last >= 0.9 and not self.at_end:
+            self._load_next()
+        elif first <= 0.1 and not self.at_start:
+            self._load_prev()
+
+    def _top_index(self) -> int:
+        return int(round(self.table.yview()[0] * len(self.rows)))
+
+    def _load_next(self):
+        top = self._top_index()
+        rows = self.fetch_after(self.rows[-1], self.page_size)
+        self.at_end = len(rows) < self.page_size
+        if not rows:
+            return
+        self.rows.extend(rows)
+
+        overflow = len(self.rows) - self.max_rows
+        if overflow > 0:
+            del self.rows[:overflow]
+            top -= overflow
+            self.at_start = False
+        self.binding.apply(self.rows)
+        self.table.yview_moveto(max(top, 0) / len(self.rows))
+
+    def _load_prev(self):
+        top = self._top_index()
+        rows = self.fetch_before(self.rows[0], self.page_size)
+        self.at_start = len(rows) < self.page_size
+        if not rows:
+            return
+        self.rows[:0] = rows
+        top += len(rows)
+
+        overflow = len(self.rows) - self.max_rows
+        if overflow > 0:
+            del self.rows[-overflow:]
+            self.at_end = False
+        self.binding.apply(self.rows)
+        self.table.yview_moveto(top / len(self.rows))
@@ -1,9 +1,53 @@
 from tkinter import ttk, messagebox, simpledialog
 import tkinter as tk
+import re
+import unicodedata
+from bisect import bisect_left
 from datetime import datetime
+from Pages.table_binding import TableBinding
 from Data import db
 
 
+_WORD = re.compile(r"\w+")
+
+
+def _normalize(text: str) -> str:
+    text = text.casefold()
+    if text.isascii():
+        return text
+    text = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in text if not unicodedata.combining(ch))
+
+
+class _SearchIndex:
+    # Word-prefix index over title, author, year, category and status, matching
+    # the prefix semantics of the Library search without a query per keystroke.
+    def __init__(self, rows=()):
+        self.rows = rows
+        postings = {}
+        for i, row in enumerate(self.rows):
+            text = " ".join(str(field) for field in row[1:6] if field is not None)
+            for word in _WORD.findall(_normalize(text)):
+                postings.setdefault(word, []).append(i)
+        self.words = sorted(postings)
+        self.postings = [postings[word] for word in self.words]
+
+    def search(self, query: str):
+        hits = None
+        for term in _WORD.findall(_normalize(query)):
+            lo = bisect_left(self.words, term)
+            hi = bisect_left(self.words, term + "\uffff")
+            matched = set()
+            for ids in self.postings[lo:hi]:
+                matched.update(ids)
+            hits = matched if hits is None else hits & matched
+            if not hits:
+                return []
+        if hits is None:
+            return self.rows
+        return [self.rows[i] for i in sorted(hits)]
+
+
 class ProfilePage(tk.Frame):
     def __init__(self, parent, current_user=None):
         super().__init__(parent)
@@ -17,7 +61,7 @@ class ProfilePage(tk.Frame):
         entry.pack(side="left", padx=10)
         entry.bind("<KeyRelease>", self.search_books)
 
-        columns = ("id", "title", "author", "year", "category")
+        columns = ("id", "title", "author", "year", "category", "status")
         self.table = ttk.Treeview(self, columns=columns, show="headings")
         for col in columns:
             if col == "id":
@@ -28,8 +72,10 @@ class ProfilePage(tk.Frame):
                 self.table.column(col, anchor="w", width=170)
 
         self.table.column("year", width=70)
+        self.table.column("status", width=140)
 
         self.table.pack(fill="both", expand=True, padx=10, pady=10)
+        self.binding = TableBinding(self.table, values=self._values)
 
         btn_frame = tk.Frame(self)
         btn_frame.pack(pady=10)
@@ -48,35 +94,30 @@ class ProfilePage(tk.Frame):
         ).grid(row=0, column=2, padx=10)
 
         self.current_user = current_user
-        self.borrowed_rows = []
-        self.favorites_rows = []
+        self.index = _SearchIndex()
         self.library_page_ref = None
-        self.refresh_books()
+        self._loaded = False
+        self.bind("<Map>", self._first_load)
+
+    def _first_load(self, event=None):
+        if not self._loaded:
+            self._loaded = True
+            self.after_idle(self.refresh_books)
 
     def set_library_ref(self, lib_frame):
         self.library_page_ref = lib_frame
 
     def search_books(self, event=None):
-        query = self.search_var.get().lower()
-
-        for row in self.table.get_children():
-            self.table.delete(row)
+        query = self.search_var.get()
 
         if self.current_user:
-            all_rows = self.borrowed_rows + self.favorites_rows
-            rows = [
-                r for r in all_rows if any(query in str(field).lower() for field in r)
-            ]
-            for row in rows:
-                self.table.insert(
-                    "", "end", values=(row[0], row[1], row[2], row[3], row[4])
-                )
+            rows = self.index.search(query)
         else:
             rows = db.books_search(query) if query else db.books_all()
-            for row in rows:
-                self.table.insert(
-                    "", "end", values=(row[0], row[1], row[2], row[3], row[4])
-                )
+        self.binding.apply(rows)
+
+    def _values(self, row):
+        return row[:6] if self.current_user else row[:5] + ("",)
 
     def details(self):
         selected = self.table.focus()
@@ -92,21 +133,9 @@ class ProfilePage(tk.Frame):
         )
 
     def refresh_books(self):
-        for row in self.table.get_children():
-            self.table.delete(row)
-
         if self.current_user:
-            self.favorites_rows = db.favorites_by_user(self.current_user[0])
-            for row in self.favorites_rows:
-                self.table.insert(
-                    "", "end", values=(row[0], row[1], row[2], row[3], row[4])
-                )
-        else:
-            rows = db.books_all()
-            for row in rows:
-                self.table.insert(
-                    "", "end", values=(row[0], row[1], row[2], row[3], row[4])
-                )
+            self.index = _SearchIndex(db.user_books(self.current_user[0]))
+        self.search_books()
 
     def open_borrowed_window(self):
         if not self.current_user:
@@ -118,7 +147,7 @@ class ProfilePage(tk.Frame):
         top.geometry("800x400")
 
         cols = ("id", "title", "author", "year", "category", "borrowed_at", "due_date")
-        tree = ttk.Treeview(top, columns=cols, show="headings")
+        tree = ttk.Treeview(top, columns=cols, show="headings", selectmode="extended")
         for c in cols:
             if c == "id":
                 tree.heading(c, text="")
@@ -184,16 +213,26 @@ class ProfilePage(tk.Frame):
             messagebox.showinfo("Due", f"{days_left} days left until due date ({due}).")
 
     def _bb_return(self, tree):
-        sel = tree.focus()
+        sel = tree.selection()
         if not sel:
             messagebox.showwarning("Select", "Select a borrowed book first.")
             return
-        v = tree.item(sel, "values")
-        book_id = v[0]
-        ok = db.return_book(self.current_user[0], book_id)
-        if ok:
-            messagebox.showinfo("Returned", f"You returned '{v[1]}'.")
-            tree.delete(sel)
+        by_book = {}
+        for iid in sel:
+            v = tree.item(iid, "values")
+            by_book.setdefault(str(v[0]), []).append((iid, v[1]))
+
+        returned = db.return_books(self.current_user[0], list(by_book))
+        if returned:
+            titles = []
+            for book_id in returned:
+                iid, title = by_book[str(book_id)].pop(0)
+                tree.delete(iid)
+                titles.append(title)
+            if len(titles) == 1:
+                messagebox.showinfo("Returned", f"You returned '{titles[0]}'.")
+            else:
+                messagebox.showinfo("Returned", f"You returned {len(titles)} books.")
             self.refresh_books()
             if self.library_page_ref:
                 try:
@@ -223,7 +262,6 @@ class ProfilePage(tk.Frame):
 
         ok = db.favorites_remove(self.current_user[0], book_id)
         if ok:
-            self.table.delete(selected)
             messagebox.showinfo(
                 "Removed", f"'{title}' was removed from your favorites."
             )
@@ -1,13 +1,164 @@
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, messagebox, filedialog
+from Pages.background import BackgroundRunner
+from Data import exporter, metrics
 
 
 class SettingsPage(tk.Frame):
     def __init__(self, parent, on_logout=None):
         super().__init__(parent)
         self.on_logout = on_logout
+        self.worker = BackgroundRunner(self)
+
+        export_frame = tk.LabelFrame(self, text="Export data")
+        export_frame.pack(padx=20, pady=(20, 0), fill="x")
+        for col, kind in enumerate(("books", "borrows", "favorites")):
+            ttk.Button(
+                export_frame,
+                text=f"Export {kind}",
+                width=15,
+                command=lambda k=kind: self.export(k),
+            ).grid(row=0, column=col, padx=10, pady=10)
+        self.export_status = tk.StringVar()
+        tk.Label(export_frame, textvariable=self.export_status, fg="#555555").grid(
+            row=1, column=0, columnspan=3, sticky="w", padx=10, pady=(0, 8)
+        )
+
+        diag = tk.LabelFrame(self, text="Diagnostics")
+        diag.pack(padx=20, pady=(20, 0), fill="both", expand=True)
+
+        controls = tk.Frame(diag)
+        controls.pack(fill="x", padx=10, pady=(8, 0))
+        self.metrics_on = tk.BooleanVar(value=metrics.enabled())
+        ttk.Checkbutton(
+            controls,
+            text="Collect query metrics",
+            variable=self.metrics_on,
+            command=self.toggle_metrics,
+        ).pack(side="left")
+        tk.Label(controls, text="Slow query (ms):").pack(side="left", padx=(20, 4))
+        self.slow_ms = tk.StringVar(
+            value=f"{metrics.slow_ms:g}" if metrics.slow_ms is not None else "50"
+        )
+        ttk.Entry(controls, textvariable=self.slow_ms, width=6).pack(side="left")
+        ttk.Button(controls, text="Export snapshot", command=self.export_metrics).pack(
+            side="right"
+        )
+        ttk.Button(controls, text="Reset", command=self.reset_metrics).pack(
+            side="right", padx=5
+        )
+        ttk.Button(controls, text="Refresh", command=self.refresh_metrics).pack(
+            side="right"
+        )
+
+        self.counters = tk.StringVar()
+        tk.Label(diag, textvariable=self.counters, fg="#555555").pack(
+            anchor="w", padx=10, pady=4
+        )
+
+        columns = ("function", "calls", "mean", "p95", "max", "rows")
+        self.metrics_table = ttk.Treeview(diag, columns=columns, show="headings", height=8)
+        for col, text in zip(
+            columns, ("Function", "Calls", "Mean ms", "p95 ms", "Max ms", "Rows")
+        ):
+            self.metrics_table.heading(col, text=text)
+            self.metrics_table.column(col, width=90, anchor="e")
+        self.metrics_table.column("function", width=200, anchor="w")
+        self.metrics_table.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+
         ttk.Button(self, text="Log Out", width=15, command=self._logout).pack(pady=20)
 
+        self.bind("<Map>", lambda event: self.refresh_metrics())
+
+    def on_show(self):
+        self.refresh_metrics()
+
+    def export(self, kind):
+        path = filedialog.asksaveasfilename(
+            parent=self,
+            title=f"Export {kind}",
+            initialfile=f"{kind}.csv",
+            defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("JSON Lines", "*.jsonl")],
+        )
+        if not path:
+            return
+
+        self.export_status.set(f"Exporting {kind}...")
+        self.worker.submit(
+            exporter.export,
+            kind,
+            path,
+            callback=lambda future: self._export_done(kind, path, future),
+        )
+
+    def _export_done(self, kind, path, future):
+        self.export_status.set("")
+        try:
+            count = future.result()
+        except Exception as e:
+            messagebox.showerror("Export failed", str(e))
+            return
+        messagebox.showinfo("Export finished", f"Wrote {count:,} {kind} rows to {path}")
+
+    def toggle_metrics(self):
+        if self.metrics_on.get():
+            try:
+                slow = float(self.slow_ms.get()) if self.slow_ms.get().strip() else None
+            except ValueError:
+                messagebox.showerror("Diagnostics", "Slow query threshold must be a number")
+                self.metrics_on.set(False)
+                return
+            metrics.enable(slow)
+        else:
+            metrics.disable()
+        self.refresh_metrics()
+
+    def reset_metrics(self):
+        metrics.reset()
+        self.refresh_metrics()
+
+    def refresh_metrics(self):
+        snap = metrics.snapshot()
+        c = snap["counters"]
+        state = "on" if snap["enabled"] else "off"
+        self.counters.set(
+            f"Metrics {state} | connections opened {c['connections_opened']:,} | "
+            f"statements {c['statements']:,} | rows {c['rows_fetched']:,} | "
+            f"slow queries {len(snap['slow_queries']):,}"
+        )
+        self.metrics_table.delete(*self.metrics_table.get_children())
+        for name, h in snap["functions"].items():
+            self.metrics_table.insert(
+                "",
+                "end",
+                values=(
+                    name,
+                    f"{h['count']:,}",
+                    f"{h['mean_ms']:.2f}",
+                    f"{h['p95_ms']:g}",
+                    f"{h['max_ms']:.2f}",
+                    f"{h['rows']:,}",
+                ),
+            )
+
+    def export_metrics(self):
+        path = filedialog.asksaveasfilename(
+            parent=self,
+            title="Export metrics snapshot",
+            initialfile="metrics.json",
+            defaultextension=".json",
+            filetypes=[("JSON", "*.json")],
+        )
+        if not path:
+            return
+        try:
+            metrics.write_snapshot(path)
+        except OSError as e:
+            messagebox.showerror("Export failed", str(e))
+            return
+        messagebox.showinfo("Export finished", f"Wrote metrics snapshot to {path}")
+
     def _logout(self):
         if self.on_logout:
             self.on_logout()
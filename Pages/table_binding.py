@@ -0,0 +1,81 @@
+from bisect import bisect_left
+from typing import Callable, Dict, List, Sequence, Set, Tuple
+
+
+def _stable_positions(positions: List[int]) -> Set[int]:
+    # Indexes of a longest increasing run of old positions: those rows are
+    # already in the right relative order and never need a move.
+    tails: List[int] = []
+    tail_idx: List[int] = []
+    prev = [-1] * len(positions)
+    for i, pos in enumerate(positions):
+        j = bisect_left(tails, pos)
+        if j == len(tails):
+            tails.append(pos)
+            tail_idx.append(i)
+        else:
+            tails[j] = pos
+            tail_idx[j] = i
+        prev[i] = tail_idx[j - 1] if j else -1
+
+    keep = set()
+    i = tail_idx[-1] if tail_idx else -1
+    while i != -1:
+        keep.add(i)
+        i = prev[i]
+    return keep
+
+
+class TableBinding:
+    def __init__(
+        self,
+        table,
+        values: Callable[[Tuple], Sequence] = lambda row: row[:5],
+        key: Callable[[Tuple], object] = lambda row: row[0],
+    ):
+        self.table = table
+        self.values = values
+        self.key = key
+        self._shown: Dict[str, tuple] = {}
+        self._order: List[str] = []
+
+    def apply(self, rows: Sequence[Tuple]):
+        new: Dict[str, tuple] = {}
+        for row in rows:
+            new.setdefault(str(self.key(row)), tuple(self.values(row)))
+        order = list(new)
+
+        stale = [iid for iid in self._order if iid not in new]
+        if stale:
+            self.table.delete(*stale)
+
+        old_pos = {iid: i for i, iid in enumerate(self._order) if iid in new}
+        survivors = [i for i, iid in enumerate(order) if iid in old_pos]
+        keep = _stable_positions([old_pos[order[i]] for i in survivors])
+        stable = {order[survivors[k]] for k in keep}
+
+        prev = None
+        for iid in order:
+            vals = new[iid]
+            shown = self._shown.get(iid)
+            if iid not in stable:
+                index = self.table.index(prev) + 1 if prev is not None else 0
+                if shown is None:
+                    self.table.insert("", index, iid=iid, values=vals)
+                else:
+                    # Tk takes the row out before counting the target index.
+                    if self.table.index(iid) < index:
+                        index -= 1
+                    self.table.move(iid, "", index)
+            if shown is not None and shown != vals:
+                self.table.item(iid, values=vals)
+            prev = iid
+
+        self._shown = new
+        self._order = order
+
+    def remove(self, iid: str):
+        if iid in self._shown:
+            self.table.delete(iid)
+            del self._shown[iid]
+            self._order.remove(iid)
@@ -1,12 +1,47 @@
-from Data.books import books as SEED_BOOKS
-from Pages.dashboard import DashboardPage
-from Pages.settings import SettingsPage
-from Pages.library import LibraryPage
-from Pages.profile import ProfilePage
 from Pages.auth import AuthPage
 from tkinter import ttk
 import tkinter as tk
-from Data import db
+from Data import db, metrics
+
+
+def _dashboard(parent, app):
+    from Pages.dashboard import DashboardPage
+
+    return DashboardPage(parent, app.current_user)
+
+
+def _library(parent, app):
+    from Pages.library import LibraryPage
+
+    page = LibraryPage(parent, app.current_user)
+    if app.profile_page:
+        page.set_profile_ref(app.profile_page)
+        app.profile_page.set_library_ref(page)
+    return page
+
+
+def _profile(parent, app):
+    from Pages.profile import ProfilePage
+
+    page = ProfilePage(parent, app.current_user)
+    if app.library_page:
+        page.set_library_ref(app.library_page)
+        app.library_page.set_profile_ref(page)
+    return page
+
+
+def _settings(parent, app):
+    from Pages.settings import SettingsPage
+
+    return SettingsPage(parent, on_logout=app._handle_logout)
+
+
+TABS = (
+    ("dashboard", "Dashboard", _dashboard),
+    ("library", "Library", _library),
+    ("profile", "Profile", _profile),
+    ("settings", "Settings", _settings),
+)
 
 
 class App(tk.Frame):
@@ -20,17 +55,56 @@ class App(tk.Frame):
         self.tabs = ttk.Notebook(self)
         self.tabs.pack(fill="both", expand=True)
 
+        self.current_user = current_user
         self._on_logout = on_logout
-
-        self.dashboard_page = DashboardPage(self.tabs, current_user)
-        self.library_page = LibraryPage(self.tabs, current_user)
-        self.profile_page = ProfilePage(self.tabs, current_user)
-        self.settings_page = SettingsPage(self.tabs, on_logout=self._handle_logout)
-
-        self.tabs.add(self.dashboard_page, text="Dashboard")
-        self.tabs.add(self.library_page, text="Library")
-        self.tabs.add(self.profile_page, text="Profile")
-        self.tabs.add(self.settings_page, text="Settings")
+        self.pages = {}
+        self._containers = {}
+        self._tab_names = {}
+
+        for name, text, _ in TABS:
+            container = tk.Frame(self.tabs)
+            self.tabs.add(container, text=text)
+            self._containers[name] = container
+            self._tab_names[str(container)] = name
+
+        self.tabs.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+        self._build(TABS[0][0])
+
+    @property
+    def dashboard_page(self):
+        return self.pages.get("dashboard")
+
+    @property
+    def library_page(self):
+        return self.pages.get("library")
+
+    @property
+    def profile_page(self):
+        return self.pages.get("profile")
+
+    @property
+    def settings_page(self):
+        return self.pages.get("settings")
+
+    def _build(self, name):
+        page = self.pages.get(name)
+        if page is None:
+            factory = next(f for tab, _, f in TABS if tab == name)
+            page = factory(self._containers[name], self)
+            page.pack(fill="both", expand=True)
+            self.pages[name] = page
+        return page
+
+    def _on_tab_changed(self, event=None):
+        name = self._tab_names.get(self.tabs.select())
+        if not name:
+            return
+        # A new page refreshes on its first <Map>; pages kept in their tab
+        # container are not re-mapped when the tab is selected again.
+        shown = name in self.pages
+        page = self._build(name)
+        if shown and hasattr(page, "on_show"):
+            page.on_show()
 
     def _handle_logout(self):
         if self._on_logout:
@@ -45,11 +119,6 @@ def _start_main_app(root, uid, username):
         _show_auth_screen(root)
 
     app_frame = App(root, current_user=(uid, username), on_logout=on_logout)
-    try:
-        app_frame.library_page.set_profile_ref(app_frame.profile_page)
-        app_frame.profile_page.set_library_ref(app_frame.library_page)
-    except Exception:
-        pass
     app_frame.pack(fill="both", expand=True)
 
 
@@ -64,8 +133,11 @@ def _show_auth_screen(root):
 
 
 if __name__ == "__main__":
+    metrics.configure_from_env()
     if not db.db_exists():
-        db.init_db(seed_books=SEED_BOOKS)
+        db.init_db(seed_books=db.SEED_PATH)
+    else:
+        db.init_db()
 
     root = tk.Tk()
     _show_auth_screen(root)
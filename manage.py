@@ -0,0 +1,60 @@
+import argparse
+import sys
+
+from Data import db, exporter, importer
+
+
+def _export(args):
+    count = exporter.export(args.kind, args.path, fmt=args.format)
+    print(f"Exported {count} {args.kind} rows to {args.path}")
+
+
+def _import(args):
+    count = importer.import_books(args.path, batch_size=args.batch_size)
+    print(f"Imported {count} books from {args.path}")
+
+
+def _stats(args):
+    mismatches = db.stats_verify()
+    for section, key, have, want in mismatches:
+        print(f"{section} {key}: stored {have}, actual {want}")
+    if args.rebuild:
+        db.stats_rebuild()
+        print(f"Rebuilt statistics ({len(mismatches)} value(s) corrected)")
+    elif mismatches:
+        print(f"{len(mismatches)} value(s) out of date; run with --rebuild")
+        return 1
+    else:
+        print("Statistics are consistent")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Library Manager maintenance")
+    parser.add_argument("--db", help="path to library.db (defaults to Data/library.db)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("export", help="stream a table to CSV or JSONL")
+    p.add_argument("kind", choices=sorted(exporter.EXPORTS))
+    p.add_argument("path", help="output file (.csv, .jsonl, optionally .gz)")
+    p.add_argument("--format", choices=("csv", "jsonl"))
+    p.set_defaults(func=_export)
+
+    p = sub.add_parser("import", help="load books from CSV or JSONL")
+    p.add_argument("path", help="input file (.csv, .jsonl, optionally .gz)")
+    p.add_argument("--batch-size", type=int, default=5000)
+    p.set_defaults(func=_import)
+
+    p = sub.add_parser("stats", help="verify or rebuild the dashboard statistics")
+    p.add_argument("--rebuild", action="store_true", help="recompute from scratch")
+    p.set_defaults(func=_stats)
+
+    args = parser.parse_args(argv)
+    if args.db:
+        db.DB_PATH = args.db
+    db.init_db()
+    return args.func(args) or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
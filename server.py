@@ -0,0 +1,276 @@
+import argparse
+import json
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from Data import db, metrics
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _int(params: dict, name: str, default: Optional[int] = None) -> Optional[int]:
+    value = params.get(name, default)
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ApiError(400, f"'{name}' must be an integer")
+
+
+MAX_LIMIT = 1000
+
+
+def _limit(params: dict, default: int = 100) -> int:
+    # SQLite reads a negative LIMIT as "no limit", so the cap needs a floor too.
+    limit = _int(params, "limit", default)
+    if limit < 1:
+        raise ApiError(400, "'limit' must be at least 1")
+    return min(limit, MAX_LIMIT)
+
+
+def _ids(body: dict) -> list:
+    ids = body.get("book_ids")
+    if ids is None and "book_id" in body:
+        ids = [body["book_id"]]
+    if not isinstance(ids, list) or not ids:
+        raise ApiError(400, "'book_ids' must be a non-empty list")
+    try:
+        return [int(i) for i in ids]
+    except (TypeError, ValueError):
+        raise ApiError(400, "'book_ids' must contain integers")
+
+
+def _book(row: Tuple) -> dict:
+    return {
+        "id": row[0],
+        "title": row[1],
+        "author": row[2],
+        "year": row[3],
+        "category": row[4],
+        "description": row[5],
+        "copies": row[6],
+        "available": row[7],
+    }
+
+
+class LibraryService:
+    def __init__(self, readers: int = 16):
+        self.readers = ThreadPoolExecutor(max_workers=readers, thread_name_prefix="db-read")
+        self.writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-write")
+
+    def write(self, fn: Callable, *args):
+        return self.writer.submit(fn, *args).result()
+
+    def books(self, params: dict):
+        limit = _limit(params)
+        if "before_title" in params:
+            rows = db.books_page_before(
+                params["before_title"], _int(params, "before_id", 0), limit
+            )
+        else:
+            rows = db.books_page(
+                params.get("after_title"), _int(params, "after_id"), limit
+            )
+        return {"books": [_book(r) for r in rows]}
+
+    def search(self, params: dict):
+        limit = _limit(params)
+        return {"books": [_book(r) for r in db.books_search(params.get("q", ""), limit)]}
+
+    def borrows(self, user_id: int, params: dict):
+        rows = db.borrowed_by_user(user_id)
+        if params.get("open") in ("1", "true"):
+            rows = [r for r in rows if r[7] is None]
+        return {
+            "borrows": [
+                {
+                    "book_id": r[0],
+                    "title": r[1],
+                    "author": r[2],
+                    "borrowed_at": r[5],
+                    "due_date": r[6],
+                    "returned_at": r[7],
+                }
+                for r in rows
+            ]
+        }
+
+    def favorites(self, user_id: int, params: dict):
+        return {
+            "favorites": [
+                {"book_id": r[0], "title": r[1], "author": r[2], "added_at": r[5]}
+                for r in db.favorites_by_user(user_id)
+            ]
+        }
+
+    def borrow(self, body: dict):
+        user_id = _int(body, "user_id")
+        if user_id is None:
+            raise ApiError(400, "'user_id' is required")
+        ids = self.write(db.borrow_books, user_id, _ids(body), _int(body, "days", 14))
+        if not ids:
+            raise ApiError(409, "no copies available")
+        return {"borrow_ids": ids}
+
+    def return_(self, body: dict):
+        user_id = _int(body, "user_id")
+        if user_id is None:
+            raise ApiError(400, "'user_id' is required")
+        return {"returned": self.write(db.return_books, user_id, _ids(body))}
+
+    def favorite_add(self, body: dict):
+        user_id, book_id = _int(body, "user_id"), _int(body, "book_id")
+        if user_id is None or book_id is None:
+            raise ApiError(400, "'user_id' and 'book_id' are required")
+        return {"added": self.write(db.favorites_add, user_id, book_id)}
+
+    def favorite_remove(self, body: dict):
+        user_id, book_id = _int(body, "user_id"), _int(body, "book_id")
+        if user_id is None or book_id is None:
+            raise ApiError(400, "'user_id' and 'book_id' are required")
+        return {"removed": self.write(db.favorites_remove, user_id, book_id)}
+
+    def route(self, method: str, path: str, params: dict, body: dict):
+        parts = [p for p in path.split("/") if p]
+        if method == "GET":
+            if parts == ["health"]:
+                return {"ok": True}
+            if parts == ["books"]:
+                return self.books(params)
+            if parts == ["search"]:
+                return self.search(params)
+            if len(parts) == 3 and parts[0] == "users" and parts[1].isdigit():
+                if parts[2] == "borrows":
+                    return self.borrows(int(parts[1]), params)
+                if parts[2] == "favorites":
+                    return self.favorites(int(parts[1]), params)
+        elif method == "POST":
+            if parts == ["borrow"]:
+                return self.borrow(body)
+            if parts == ["return"]:
+                return self.return_(body)
+            if parts == ["favorites"]:
+                return self.favorite_add(body)
+        elif method == "DELETE":
+            if parts == ["favorites"]:
+                return self.favorite_remove(body)
+        raise ApiError(404, f"no route for {method} {path}")
+
+    def shutdown(self):
+        self.readers.shutdown(wait=True)
+        self.writer.shutdown(wait=True)
+
+
+class Handler(BaseHTTPRequestHandler):
+    server_version = "LibraryManager/1.0"
+
+    def _handle(self, method: str):
+        url = urlparse(self.path)
+        params: Dict[str, str] = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        try:
+            body = {}
+            length = int(self.headers.get("Content-Length") or 0)
+            if length:
+                try:
+                    body = json.loads(self.rfile.read(length))
+                except ValueError:
+                    raise ApiError(400, "request body must be JSON")
+                if not isinstance(body, dict):
+                    raise ApiError(400, "request body must be a JSON object")
+            status, payload = 200, self.server.service.route(method, url.path, params, body)
+        except ApiError as e:
+            status, payload = e.status, {"error": str(e)}
+        except Exception as e:
+            status, payload = 500, {"error": str(e)}
+
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class LibraryHTTPServer(HTTPServer):
+    request_queue_size = 1024
+    daemon_threads = True
+
+    def __init__(self, address, readers: int = 16, verbose: bool = False):
+        super().__init__(address, Handler)
+        self.service = LibraryService(readers)
+        self.verbose = verbose
+
+    def process_request(self, request, client_address):
+        self.service.readers.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.service.shutdown()
+
+
+def serve_in_thread(
+    host: str = "127.0.0.1", port: int = 0, readers: int = 16
+) -> Tuple[LibraryHTTPServer, threading.Thread]:
+    server = LibraryHTTPServer((host, port), readers)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, thread
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Library Manager HTTP/JSON service")
+    parser.add_argument("--db", help="path to library.db (defaults to Data/library.db)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--readers", type=int, default=16)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.db:
+        db.DB_PATH = args.db
+    metrics.configure_from_env()
+    db.init_db()
+
+    server = LibraryHTTPServer((args.host, args.port), args.readers, args.verbose)
+    print(f"Serving {db.DB_PATH} on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())